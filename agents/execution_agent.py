@@ -1,4 +1,8 @@
 class ExecutionAgent:
+    pure = True
+    reads = ()
+    writes = ("exec",)
+
     def act(self,state):
         state.shared["exec"]="running"
         return state
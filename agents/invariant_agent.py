@@ -1,6 +1,60 @@
-import hashlib, json
+import hashlib, json, bisect, weakref
+
+# fingerprint = sha256 over per-key leaf digests in sorted key order.
+# deterministic and insertion-order independent like hashing the sorted
+# JSON, but only keys touched since the last call are re-serialized
+def _leaf(k, v):
+    return hashlib.sha256(json.dumps([k, v], sort_keys=True).encode()).digest()
+
+def _combine(order, leaves):
+    return hashlib.sha256(b"".join(leaves[k] for k in order)).hexdigest()
+
+def merkle_root(shared):
+    # full recompute (reference for verify mode and plain-dict states)
+    leaves = {k: _leaf(k, v) for k, v in shared.items()}
+    return _combine(sorted(leaves), leaves)
+
+class _Cache:
+    def __init__(self, shared):
+        self.feed = shared.subscribe()
+        self.feed.update(shared.keys())
+        self.leaves = {}
+        self.order = []    # sorted keys
+
 class InvariantAgent:
+    # hashes every key, so the scheduler orders it after every earlier writer
+    reads = ("*",)
+    writes = ("fingerprint",)
+
+    def __init__(self, verify=False):
+        self.verify = verify
+        self._caches = {}  # id(shared) -> _Cache, dropped when shared is collected
+
+    def fingerprint(self, shared, exclude=()):
+        # exclude: keys left out of the hash (e.g. the volatile "fingerprint")
+        if not hasattr(shared, "subscribe"):
+            return merkle_root({k: v for k, v in shared.items() if k not in exclude})
+        c = self._caches.get(id(shared))
+        if c is None:
+            c = self._caches[id(shared)] = _Cache(shared)
+            weakref.finalize(shared, self._caches.pop, id(shared), None)
+        for k in c.feed:
+            if k in shared:
+                if k not in c.leaves:
+                    bisect.insort(c.order, k)
+                c.leaves[k] = _leaf(k, shared[k])
+            elif k in c.leaves:
+                del c.leaves[k]
+                c.order.pop(bisect.bisect_left(c.order, k))
+        c.feed.clear()
+        order = [k for k in c.order if k not in exclude] if exclude else c.order
+        h = _combine(order, c.leaves)
+        if self.verify:
+            full = merkle_root({k: v for k, v in shared.items() if k not in exclude})
+            if full != h:
+                raise RuntimeError(f"incremental fingerprint {h} != full {full}")
+        return h
+
     def act(self,state):
-        h = hashlib.sha256(json.dumps(state.shared,sort_keys=True).encode()).hexdigest()
-        state.shared["fingerprint"]=h
+        state.shared["fingerprint"]=self.fingerprint(state.shared)
         return state
@@ -1,4 +1,7 @@
 class MonitorAgent:
+    reads = ()
+    writes = ()
+
     def act(self,state):
         print("MONITOR STEP", state.step)
         return state
@@ -1,4 +1,8 @@
 class PlannerAgent:
+    pure = True
+    reads = ()
+    writes = ("plan",)
+
     def act(self,state):
         state.shared["plan"]="active"
         return state
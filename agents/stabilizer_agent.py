@@ -1,4 +1,8 @@
 ﻿class StabilizerAgent:
+    pure = True
+    reads = ()
+    writes = ("stabilizer",)
+
     def act(self, state):
         state.shared["stabilizer"] = {"status":"active","action":"tighten_gate_hint"}
         return state
@@ -1,4 +1,8 @@
 ﻿class SummarizerAgent:
+    pure = True
+    reads = ("*",)
+    writes = ("summary",)
+
     def act(self, state):
         keys = sorted(list(state.shared.keys()))
         state.shared["summary"] = f"keys={len(keys)}:{','.join(keys[:12])}"
@@ -0,0 +1,51 @@
+from collections import deque
+
+# convergence over (state digest, gate status) per step. the digest leaves
+# out the volatile "fingerprint" key, which hashes the previous fingerprint
+# and so changes every step even when nothing else does.
+#   fixed point: the same observation `patience` steps in a row
+#   cycle:       the last 2*p observations are one period of length p, twice
+VOLATILE = ("fingerprint",)
+PATIENCE = 3
+WINDOW = 32   # longest cycle period looked for is WINDOW // 2
+
+class Convergence:
+    def __init__(self, patience=PATIENCE, window=WINDOW, cycles=True):
+        self.patience = max(2, patience)
+        self.window = max(window, 2 * self.patience)
+        self.cycles = cycles
+        self.reason = None
+        self.period = None
+        self.step = None
+        self._hist = deque(maxlen=self.window)
+
+    def observe(self, step, digest, gate_status):
+        # returns the stop reason once converged ("fixed_point" / "cycle"), else None
+        if self.reason is not None:
+            return self.reason
+        h = self._hist
+        h.append((digest, gate_status))
+        n = len(h)
+        if n >= self.patience and all(h[-i] == h[-1] for i in range(2, self.patience + 1)):
+            self.reason, self.period, self.step = "fixed_point", 1, step
+        elif self.cycles:
+            for p in range(2, n // 2 + 1):
+                if all(h[-i] == h[-i - p] for i in range(1, p + 1)):
+                    self.reason, self.period, self.step = "cycle", p, step
+                    break
+        return self.reason
+
+    def history(self):
+        return [list(h) for h in self._hist]
+
+    def restore(self, history):
+        self._hist.extend(tuple(h) for h in history)
+
+    def as_dict(self, steps_run, steps_requested):
+        return {
+            "reason": self.reason or "max_steps",
+            "period": self.period,
+            "converged_at": self.step,
+            "steps_run": steps_run,
+            "steps_requested": steps_requested,
+        }
@@ -1,4 +1,6 @@
-﻿from agents.planner_agent import PlannerAgent
+﻿import copy
+
+from agents.planner_agent import PlannerAgent
 from agents.execution_agent import ExecutionAgent
 from agents.invariant_agent import InvariantAgent
 from agents.monitor_agent import MonitorAgent
@@ -11,6 +13,10 @@ from coordination.gate.gate import apply_gate
 from metrics.horizon import horizon
 
 from tools.topology_memory import topo_event, memory_update
+from runtime.swarm_state.swarm_state import Spawn
+from runtime.swarm_state.versions import VersionStore, diff, DELETED
+from engine.execution.scheduler import Scheduler
+from engine.execution.memo import Memo, MAXSIZE
 
 planner = PlannerAgent()
 executor = ExecutionAgent()
@@ -20,46 +26,115 @@ mon = MonitorAgent()
 stabilizer = StabilizerAgent()
 summarizer = SummarizerAgent()
 
-_prev_shared = {}
+# planner/executor write disjoint keys and share a stage; the invariant agent
+# reads everything and follows them
+core = Scheduler([planner, executor, inv])
+spawner = Scheduler([stabilizer, summarizer])
+idle_steps = 0  # reactive steps that started with nothing changed
+
+def configure(parallel=True, reactive=False, memoize=False, memo_size=MAXSIZE):
+    # reactive: agents run only when keys they read changed (see Scheduler)
+    # memoize: pure agents replay cached writes for an already-seen input slice
+    global idle_steps
+    memo = Memo(memo_size) if memoize else None
+    for s in (core, spawner):
+        s.parallel, s.reactive, s.memo = parallel, reactive, memo
+        s.ran = s.skipped = 0
+    idle_steps = 0
+
+_versions = VersionStore()
+_prev_owner = None  # the shared mapping _versions tracks
+
+def reset():
+    global _versions, _prev_owner
+    _versions = VersionStore()
+    _prev_owner = None
+
+def versions():
+    return _versions
+
+def resume(state):
+    # restored state becomes the drift baseline, as if its step just committed
+    global _prev_owner
+    reset()
+    _prev_owner = state.shared
+    _versions.commit_from(state.step, state.shared)
+    if hasattr(state.shared, "dirty"):
+        state.shared.dirty.clear()
+
+def _commit(state):
+    # record this step as a new version holding only the touched keys
+    shared = state.shared
+    if not hasattr(shared, "dirty"):
+        _versions.commit_from(state.step, shared)
+        return
+    _versions.commit_from(state.step, shared, shared.dirty)
+    shared.dirty.clear()
+
+def rollback(state, to_step):
+    # restore state.shared to the version recorded at to_step
+    cur = _versions.head
+    target = _versions.rollback(to_step)
+    for k, (_, new) in diff(cur, target).items():
+        if new is DELETED:
+            del state.shared[k]
+        else:
+            state.shared[k] = copy.deepcopy(new)
+    if hasattr(state.shared, "dirty"):
+        state.shared.dirty.clear()
+    state.step = to_step
+    return state
 
 def step(state, mode="lab"):
-    global _prev_shared
+    global _prev_owner, idle_steps
+
+    if _prev_owner is not state.shared:
+        reset()
+        _prev_owner = state.shared
 
     state.step += 1
 
-    planner.act(state)
-    executor.act(state)
-    inv.act(state)
+    core.run(state)
 
+    dirty = getattr(state.shared, "dirty", None)
     pressure = compute_pressure(state)
-    drift = compute_drift(_prev_shared, state.shared)
+    if core.reactive and dirty is not None and not dirty:
+        # short-circuit: state is exactly the last committed version
+        idle_steps += 1
+        drift = 0.0
+    else:
+        drift = compute_drift(_versions.head, state.shared, dirty)
 
     apply_gate(state, pressure, drift, alpha=0.85)
     h = horizon(0.85, pressure)
 
-    spawned = []
+    spawned, agents = [], []
 
     # Spawn policy
     if drift >= 0.1:
-        stabilizer.act(state)
+        agents.append(stabilizer)
         spawned.append("StabilizerAgent")
     if pressure >= 0.85:
-        summarizer.act(state)
+        agents.append(summarizer)
         spawned.append("SummarizerAgent")
+    if agents:
+        spawner.run(state, only=agents)
 
     if spawned:
-        state.shared["_spawn"] = {"agents": spawned, "reason": {"drift": drift, "pressure": pressure}}
+        state.spawn = Spawn(spawned, drift, pressure)
 
-    gate_status = state.shared.get("_gate", {}).get("status", "OK")
+    gate = state.gate
+    gate_status = gate.status if gate is not None else "OK"
+    state.metrics = {"drift": drift, "pressure": pressure, "horizon": h, "spawned": spawned}
 
     # record topology + memory every step (ACTIVE + LAB)
     topo_event(state.step, spawned, {"drift": drift, "pressure": pressure, "gate": gate_status})
     memory_update(gate_status, drift, pressure, spawned)
 
     # Print line (keep stable)
-    print("ΔΦ:", drift, "Π:", round(pressure, 4), "H:", round(h, 2), "α_eff:", round(state.shared['_gate']['alpha_eff'], 4), gate_status)
+    print("ΔΦ:", drift, "Π:", round(pressure, 4), "H:", round(h, 2), "α_eff:", round(gate.alpha_eff, 4), gate_status)
 
     mon.act(state)
 
-    _prev_shared = dict(state.shared)
+    _commit(state)
     return state
@@ -0,0 +1,65 @@
+import json, hashlib, threading
+from collections import OrderedDict
+from runtime.swarm_state.versions import DELETED, freeze
+
+# replay cache for agents that declare pure = True: act() must be a function
+# of the declared `reads` slice of state.shared and touch only `writes`.
+# key = (agent, digest of the read slice); value = the written keys' values
+# after act. agents reading "*" are keyed on the whole state; agents whose
+# writes are undeclared or "*" are never cached
+MAXSIZE = 256
+
+def _digest(shared, reads):
+    keys = sorted(shared) if "*" in reads else sorted(k for k in reads if k in shared)
+    blob = json.dumps([[k, shared[k]] for k in keys], sort_keys=True, default=str)
+    return hashlib.sha256(blob.encode()).digest()
+
+class Memo:
+    def __init__(self, maxsize=MAXSIZE):
+        self.maxsize = maxsize
+        self.hits = self.misses = 0
+        self.stats = {}    # agent class name -> {"hits", "misses"}
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def cacheable(self, agent):
+        writes = getattr(agent, "writes", ("*",))
+        return getattr(agent, "pure", False) and "*" not in writes and self.maxsize > 0
+
+    def _count(self, agent, hit):
+        s = self.stats.setdefault(type(agent).__name__, {"hits": 0, "misses": 0})
+        s["hits" if hit else "misses"] += 1
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+
+    def act(self, agent, state):
+        if not self.cacheable(agent):
+            return agent.act(state)
+        shared = state.shared
+        key = (id(agent), _digest(shared, getattr(agent, "reads", ("*",))))
+        with self._lock:
+            out = self._cache.get(key)
+            if out is not None:
+                self._cache.move_to_end(key)
+            self._count(agent, out is not None)
+        if out is not None:
+            # replay: hand out copies so the cached delta stays pristine
+            for k, v in out.items():
+                if v is DELETED:
+                    shared.pop(k, None)
+                else:
+                    shared[k] = freeze(v)
+            return state
+        agent.act(state)
+        out = {k: freeze(shared[k]) if k in shared else DELETED for k in agent.writes}
+        with self._lock:
+            self._cache[key] = out
+            while len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+        return state
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
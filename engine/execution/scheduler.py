@@ -0,0 +1,108 @@
+import os, threading
+from concurrent.futures import ThreadPoolExecutor
+
+# agents declare the state.shared keys they touch:
+#   reads = ("plan",)      writes = ("fingerprint",)
+# ALL means "any key" (e.g. agents that walk the whole state). agents without
+# declarations are treated as reading and writing ALL, i.e. run alone.
+# agents are levelled into stages in declaration order: an agent lands one
+# stage after the last earlier agent it conflicts with, and the agents of a
+# stage run concurrently on a shared thread pool
+ALL = "*"
+WORKERS = min(8, (os.cpu_count() or 1) + 4)
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def _executor():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers=WORKERS, thread_name_prefix="agent")
+        return _pool
+
+def shutdown():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True)
+            _pool = None
+
+def _keys(agent, attr):
+    return frozenset(getattr(agent, attr, (ALL,)))
+
+def _hit(x, y):
+    return bool(x and y) and (ALL in x or ALL in y or not x.isdisjoint(y))
+
+def conflicts(a, b):
+    # write/write and read/write overlaps force an order; read/read does not
+    aw, bw = _keys(a, "writes"), _keys(b, "writes")
+    return _hit(aw, bw) or _hit(aw, _keys(b, "reads")) or _hit(_keys(a, "reads"), bw)
+
+def plan_stages(agents):
+    level = []
+    for i, a in enumerate(agents):
+        level.append(1 + max((level[j] for j in range(i) if conflicts(agents[j], a)), default=-1))
+    stages = [[] for _ in range(max(level, default=-1) + 1)]
+    for a, lv in zip(agents, level):
+        stages[lv].append(a)
+    return stages
+
+class Scheduler:
+    # reactive=True runs an agent only on its first step and afterwards only
+    # when a key it reads changed since it last ran (its own writes excluded).
+    # changes come from per-agent subscriptions on state.shared
+    def __init__(self, agents, parallel=True, reactive=False):
+        self.agents = list(agents)
+        self.parallel = parallel
+        self.reactive = reactive
+        self.stages = plan_stages(self.agents)
+        self.ran = self.skipped = 0
+        self.memo = None   # engine.execution.memo.Memo replaying pure agents
+        self._owner = None
+        self._feeds = {}
+
+    def _due(self, a, shared):
+        if self._owner is not shared:
+            self._owner = shared
+            self._feeds = {}
+        if a not in self._feeds:
+            # first run; agents that read nothing never need to run again
+            tracked = hasattr(shared, "subscribe") and _keys(a, "reads")
+            self._feeds[a] = shared.subscribe() if tracked else None
+            return True
+        feed = self._feeds[a]
+        if feed is None:
+            return not hasattr(shared, "subscribe")  # untracked mapping: always run
+        reads = _keys(a, "reads")
+        if ALL not in reads:
+            feed.intersection_update(reads)
+        feed.difference_update(_keys(a, "writes"))
+        return bool(feed)
+
+    def _act(self, a, state):
+        feed = self._feeds.get(a)
+        if feed is not None:
+            feed.clear()
+        if self.memo is not None:
+            self.memo.act(a, state)
+        else:
+            a.act(state)
+
+    def run(self, state, only=None):
+        # only: subset of self.agents to consider this time (stage order kept)
+        for stage in self.stages:
+            stage = [a for a in stage if only is None or a in only]
+            if self.reactive:
+                due = [a for a in stage if self._due(a, state.shared)]
+                self.skipped += len(stage) - len(due)
+                stage = due
+            self.ran += len(stage)
+            if len(stage) == 1 or not self.parallel:
+                for a in stage:
+                    self._act(a, state)
+                continue
+            futures = [_executor().submit(self._act, a, state) for a in stage]
+            for f in futures:
+                f.result()  # re-raises the agent's exception
+        return state
@@ -0,0 +1,186 @@
+import os, sys, json, math, time, array, argparse
+
+try:
+    import numpy as np
+except ImportError:  # stdlib array fallback
+    np = None
+
+# per-step scalars kept next to the ledger as raw little-endian typed arrays:
+#   <run_dir>/columns/<name>.bin  + schema.json (name -> array typecode)
+# readable with array.fromfile or np.memmap without touching the JSON ledger
+COLUMNS_DIR = "columns"
+SCHEMA = {
+    "step": "q",
+    "ts": "d",
+    "alpha": "d",
+    "alpha_eff": "d",
+    "status": "b",      # index into STATUS, -1 unknown
+    "drift": "d",
+    "pressure": "d",
+    "horizon": "d",
+    "spawn": "B",       # bitmask of SPAWN_BITS
+}
+STATUS = ("OK", "CONTRACTING")
+SPAWN_BITS = {"StabilizerAgent": 1, "SummarizerAgent": 2}
+NAN = float("nan")
+
+def _dir(run_dir):
+    return os.path.join(run_dir, COLUMNS_DIR)
+
+def status_code(s):
+    return STATUS.index(s) if s in STATUS else -1
+
+def spawn_mask(agents):
+    m = 0
+    for a in agents or ():
+        m |= SPAWN_BITS.get(a, 0)
+    return m
+
+def spawned_from_mask(m):
+    return [a for a, bit in SPAWN_BITS.items() if m & bit]
+
+class ColumnWriter:
+    # buffers rows in typed arrays and appends them to the column files in batches
+    def __init__(self, run_dir, flush_every=256):
+        self.dir = _dir(run_dir)
+        self.flush_every = flush_every
+        self._buf = {k: array.array(t) for k, t in SCHEMA.items()}
+
+    def append(self, step, gate, drift=NAN, pressure=NAN, horizon=NAN, spawned=(), ts=None):
+        gate = gate or {}
+        b = self._buf
+        b["step"].append(int(step))
+        b["ts"].append(time.time() if ts is None else float(ts))
+        b["alpha"].append(float(gate.get("alpha", NAN)))
+        b["alpha_eff"].append(float(gate.get("alpha_eff", NAN)))
+        b["status"].append(status_code(gate.get("status")))
+        b["drift"].append(float(drift))
+        b["pressure"].append(float(pressure))
+        b["horizon"].append(float(horizon))
+        b["spawn"].append(spawn_mask(spawned))
+        if len(b["step"]) >= self.flush_every:
+            self.flush()
+
+    def flush(self):
+        if not len(self._buf["step"]):
+            return
+        os.makedirs(self.dir, exist_ok=True)
+        schema = os.path.join(self.dir, "schema.json")
+        if not os.path.exists(schema):
+            with open(schema, "w", encoding="utf-8") as f:
+                json.dump({"byteorder": "little", "columns": SCHEMA}, f, indent=2)
+        for k, a in self._buf.items():
+            if sys.byteorder != "little":
+                a.byteswap()
+            with open(os.path.join(self.dir, k + ".bin"), "ab") as f:
+                a.tofile(f)
+        self._buf = {k: array.array(t) for k, t in SCHEMA.items()}
+
+def row_count(run_dir):
+    # rows on disk (buffered rows are not counted: flush first)
+    p = os.path.join(_dir(run_dir), "step.bin")
+    return os.path.getsize(p) // array.array(SCHEMA["step"]).itemsize if os.path.exists(p) else 0
+
+def truncate_columns(run_dir, rows):
+    # drop rows past `rows` in every column (resume after a crash)
+    for k, t in SCHEMA.items():
+        p = os.path.join(_dir(run_dir), k + ".bin")
+        if os.path.exists(p):
+            with open(p, "r+b") as f:
+                f.truncate(min(os.path.getsize(p), rows * array.array(t).itemsize))
+
+def has_columns(run_dir):
+    return os.path.exists(os.path.join(_dir(run_dir), "schema.json"))
+
+def load_columns(run_dir, mmap=True):
+    # name -> np.memmap (read-only, zero parse) or array.array without numpy
+    out = {}
+    d = _dir(run_dir)
+    for k, t in SCHEMA.items():
+        p = os.path.join(d, k + ".bin")
+        if not os.path.exists(p) or not os.path.getsize(p):
+            out[k] = np.zeros(0, dtype=_dtype(t)) if np is not None else array.array(t)
+            continue
+        if np is not None:
+            out[k] = np.memmap(p, dtype=_dtype(t), mode="r") if mmap else np.fromfile(p, dtype=_dtype(t))
+            continue
+        a = array.array(t)
+        with open(p, "rb") as f:
+            a.frombytes(f.read())
+        if sys.byteorder != "little":
+            a.byteswap()
+        out[k] = a
+    return out
+
+def _dtype(t):
+    return {"q": "<i8", "d": "<f8", "b": "i1", "B": "u1"}[t]
+
+def _mean(xs):
+    xs = [x for x in xs if not math.isnan(x)]
+    return sum(xs) / len(xs) if xs else NAN
+
+def _max(xs):
+    xs = [x for x in xs if not math.isnan(x)]
+    return max(xs) if xs else NAN
+
+def aggregate(cols):
+    n = len(cols["step"])
+    if not n:
+        return {"steps": 0}
+    if np is not None:
+        status, spawn = np.asarray(cols["status"]), np.asarray(cols["spawn"])
+        contracting = int((status == 1).sum())
+        spawn_counts = {a: int(((spawn & bit) != 0).sum()) for a, bit in SPAWN_BITS.items()}
+        mean, mx = (lambda a: float(np.nanmean(a))), (lambda a: float(np.nanmax(a)))
+    else:
+        contracting = cols["status"].tolist().count(1)
+        spawn_counts = {a: sum(1 for m in cols["spawn"] if m & bit) for a, bit in SPAWN_BITS.items()}
+        mean, mx = _mean, _max
+    return {
+        "steps": n,
+        "first_step": int(cols["step"][0]),
+        "last_step": int(cols["step"][-1]),
+        "contracting_steps": contracting,
+        "contracting_rate": contracting / n,
+        "alpha_eff_mean": mean(cols["alpha_eff"]),
+        "alpha_eff_max": mx(cols["alpha_eff"]),
+        "drift_mean": mean(cols["drift"]),
+        "pressure_mean": mean(cols["pressure"]),
+        "pressure_max": mx(cols["pressure"]),
+        "spawn_counts": spawn_counts,
+    }
+
+def build_from_ledger(run_dir, ledger_path=None):
+    # backfill columns for runs recorded before the store existed; drift and
+    # pressure are only in the ledger when something spawned (NaN otherwise)
+    from ledger.replay import iter_entries
+    ledger_path = ledger_path or os.path.join(run_dir, "ledger.jsonl")
+    d = _dir(run_dir)
+    for k in SCHEMA:
+        p = os.path.join(d, k + ".bin")
+        if os.path.exists(p):
+            os.remove(p)
+    w = ColumnWriter(run_dir)
+    n = 0
+    for e in iter_entries(ledger_path):
+        shared = e.get("shared") or {}
+        spawn = shared.get("_spawn") if isinstance(shared.get("_spawn"), dict) else {}
+        reason = spawn.get("reason") or {}
+        w.append(e.get("step", -1), shared.get("_gate"), reason.get("drift", NAN), reason.get("pressure", NAN),
+                 spawned=spawn.get("agents"), ts=e.get("ts") or 0.0)
+        n += 1
+    w.flush()
+    return n
+
+def main():
+    ap = argparse.ArgumentParser(description="Build or summarize the columnar metrics store of a run")
+    ap.add_argument("run_dirs", nargs="+")
+    ap.add_argument("--rebuild", action="store_true", help="backfill columns from ledger.jsonl")
+    args = ap.parse_args()
+    for rd in args.run_dirs:
+        if args.rebuild or not has_columns(rd):
+            print("✔ COLUMNS:", rd, build_from_ledger(rd), "steps")
+        print(json.dumps(aggregate(load_columns(rd)), indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+import os, json, struct, argparse
+
+# sidecar <ledger>.idx: one fixed-size record per ledger line
+#   step (int64), byte offset (int64), kind (int64), ts (float64)
+REC = struct.Struct("<qqqd")
+
+KIND_FULL = 1   # checkpoint / legacy full-state line
+KIND_DELTA = 2
+
+def index_path(ledger_path):
+    return ledger_path + ".idx"
+
+def line_kind(raw):
+    return KIND_DELTA if b'"kind": "delta"' in raw else KIND_FULL
+
+def append_record(ledger_path, step, offset, kind, ts):
+    with open(index_path(ledger_path), "ab") as f:
+        f.write(REC.pack(int(step), int(offset), int(kind), float(ts or 0.0)))
+
+class LedgerIndex:
+    # random access over the .idx file without loading it; records are step-ordered
+    def __init__(self, ledger_path):
+        self.path = index_path(ledger_path)
+        self._f = open(self.path, "rb")
+        self.n = os.fstat(self._f.fileno()).st_size // REC.size
+
+    def __len__(self):
+        return self.n
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._f.close()
+
+    def record(self, i):
+        self._f.seek(i * REC.size)
+        return REC.unpack(self._f.read(REC.size))
+
+    def bisect_step(self, k):
+        # first record with step >= k (== len(self) if none)
+        lo, hi = 0, self.n
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.record(mid)[0] < k:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def bisect_ts(self, t):
+        # first record with ts >= t
+        lo, hi = 0, self.n
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.record(mid)[3] < t:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def checkpoint_before(self, i):
+        # index of the nearest full-state record at or before i
+        i = min(i, self.n - 1)
+        while i > 0 and self.record(i)[2] != KIND_FULL:
+            i -= 1
+        return max(i, 0)
+
+def open_index(ledger_path):
+    # None when the ledger has no sidecar index (callers fall back to scanning)
+    if not os.path.exists(index_path(ledger_path)):
+        return None
+    return LedgerIndex(ledger_path)
+
+def build_index(ledger_path):
+    tmp = index_path(ledger_path) + ".tmp"
+    n = 0
+    with open(ledger_path, "rb") as src, open(tmp, "wb") as out:
+        off = 0
+        for raw in src:
+            here, off = off, off + len(raw)
+            if not raw.strip():
+                continue
+            try:
+                e = json.loads(raw)
+            except Exception:
+                continue
+            out.write(REC.pack(int(e.get("step", -1)), here, line_kind(raw), float(e.get("ts") or e.get("time") or 0.0)))
+            n += 1
+    os.replace(tmp, index_path(ledger_path))
+    return n
+
+def _ledgers(paths):
+    for p in paths:
+        if os.path.isdir(p):
+            for r, dirs, files in os.walk(p):
+                for fn in files:
+                    if fn.endswith(".jsonl"):
+                        yield os.path.join(r, fn)
+        else:
+            yield p
+
+def main():
+    ap = argparse.ArgumentParser(description="(Re)build step->offset indexes for ledger files")
+    ap.add_argument("paths", nargs="+", help="ledger .jsonl files or directories to walk")
+    args = ap.parse_args()
+    for p in _ledgers(args.paths):
+        print("✔ INDEXED:", p, build_index(p), "entries")
+
+if __name__ == "__main__":
+    main()
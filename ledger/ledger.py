@@ -1,8 +1,103 @@
 ﻿import os, json, time
+from ledger.index import append_record, build_index, index_path, open_index, KIND_FULL, KIND_DELTA
+from ledger.segments import seal
+
+LEDGER_NAME = "ledger.jsonl"
+
+# delta format: full checkpoint every K steps, per-key set/del deltas in between
+CHECKPOINT_EVERY = 25
+
+def _enc(v):
+    return json.dumps(v, ensure_ascii=False)
+
+def _obj(pairs):
+    # assemble a JSON object from already-encoded values (no re-serialization)
+    return "{" + ", ".join(f"{_enc(k)}: {v}" for k, v in pairs) + "}"
+
+# fmt="full"  -> {"ts", "step", "shared"} every line (legacy format)
+# fmt="delta" -> {"ts", "step", "kind": "full", "shared"} every K steps,
+#                {"ts", "step", "kind": "delta", "set", "del"} in between
+class LedgerWriter:
+    def __init__(self, run_dir, fmt="full", checkpoint_every=CHECKPOINT_EVERY, name=LEDGER_NAME,
+                 rotate_bytes=None, rotate_steps=None, codec="gzip"):
+        if fmt not in ("full", "delta"):
+            raise ValueError(f"unknown ledger format: {fmt}")
+        self.run_dir = run_dir
+        self.path = os.path.join(run_dir, name)
+        self.fmt = fmt
+        self.checkpoint_every = max(1, int(checkpoint_every))
+        self._prev = None   # key -> encoded value at the last written step
+        self._since = 0     # deltas written since the last checkpoint
+        self._indexed = False
+        # segment rotation: seal the active file once it reaches either bound
+        self.rotate_bytes = rotate_bytes
+        self.rotate_steps = rotate_steps
+        self.codec = codec
+        self._seg_entries = 0
+        self._seg_bytes = 0
+
+    def _line(self, ts, step, shared):
+        # shared may be any mapping (e.g. SwarmState.shared view), not just a dict
+        cur = {k: _enc(v) for k, v in shared.items()}
+        head = [("ts", _enc(ts)), ("step", _enc(step))]
+        if self.fmt == "full":
+            return _obj(head + [("shared", _obj(cur.items()))]), KIND_FULL
+        if self._prev is None or self._since >= self.checkpoint_every:
+            self._since = 0
+            line, kind = _obj(head + [("kind", '"full"'), ("shared", _obj(cur.items()))]), KIND_FULL
+        else:
+            self._since += 1
+            prev = self._prev
+            sets = [(k, v) for k, v in cur.items() if prev.get(k) != v]
+            dels = [k for k in prev if k not in cur]
+            line, kind = _obj(head + [("kind", '"delta"'), ("set", _obj(sets)), ("del", _enc(dels))]), KIND_DELTA
+        self._prev = cur
+        return line, kind
+
+    def _ensure_index(self):
+        # ledgers written before the sidecar existed get indexed once up front
+        if not self._indexed:
+            if os.path.exists(self.path):
+                if not os.path.exists(index_path(self.path)):
+                    build_index(self.path)
+                with open_index(self.path) as idx:
+                    self._seg_entries = len(idx)
+                self._seg_bytes = os.path.getsize(self.path)
+            self._indexed = True
+
+    def _should_rotate(self):
+        if self.rotate_steps and self._seg_entries >= self.rotate_steps:
+            return True
+        return bool(self.rotate_bytes and self._seg_bytes >= self.rotate_bytes)
+
+    def rotate(self):
+        seal(self.path, codec=self.codec)
+        # every segment opens with a checkpoint so it can be read on its own
+        self._prev = None
+        self._since = 0
+        self._seg_entries = 0
+        self._seg_bytes = 0
+
+    def write(self, step, shared):
+        os.makedirs(self.run_dir, exist_ok=True)
+        self._ensure_index()
+        ts = time.time()
+        line, kind = self._line(ts, step, shared)
+        data = (line + "\n").encode("utf-8")
+        with open(self.path, "ab") as f:
+            offset = f.tell()
+            f.write(data)
+        append_record(self.path, step, offset, kind, ts)
+        self._seg_entries += 1
+        self._seg_bytes = offset + len(data)
+        if self._should_rotate():
+            self.rotate()
+
+_writers = {}
 
 def write_entry(run_dir, step, shared):
-    os.makedirs(run_dir, exist_ok=True)
-    path = os.path.join(run_dir, "ledger.jsonl")
-    entry = {"ts": time.time(), "step": step, "shared": shared}
-    with open(path, "a", encoding="utf-8") as f:
-        f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+    path = os.path.join(run_dir, LEDGER_NAME)
+    w = _writers.get(path)
+    if w is None:
+        w = _writers[path] = LedgerWriter(run_dir)
+    w.write(step, shared)
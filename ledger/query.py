@@ -0,0 +1,150 @@
+import re, sys, json, argparse, datetime
+from ledger.replay import iter_lines, LEDGER_PATH
+from ledger.index import open_index
+from ledger.segments import sealed_segments
+
+# writer lines start with {"ts": <float>, "step": <int>: ranges are checked on
+# that prefix before anything is decoded
+_HEAD = re.compile(rb'^\{"ts": ([-+0-9.eE]+), "step": (-?\d+)')
+
+def _step_at_ts(path, t):
+    # first step recorded at or after time t (None when the ledger ends before t)
+    for seg in sealed_segments(path):
+        if seg["last_ts"] >= t:
+            return seg["first_step"]
+    idx = open_index(path)
+    if idx is None:
+        return -1  # no index: scan from the top and filter on ts
+    with idx:
+        i = idx.bisect_ts(t)
+        return idx.record(i)[0] if i < len(idx) else None
+
+def _gate_status(shared):
+    gate = shared.get("_gate")
+    return gate.get("status") if isinstance(gate, dict) else None
+
+def _spawned(shared):
+    spawn = shared.get("_spawn")
+    return (spawn.get("agents") or []) if isinstance(spawn, dict) else []
+
+def query(path=LEDGER_PATH, status=None, spawned=None, since=None, until=None,
+          step_from=None, step_to=None, where=None):
+    # streams matching {"ts", "step", "shared"} entries; memory stays at one
+    # folded state regardless of ledger size
+    start = step_from
+    if since is not None:
+        s = _step_at_ts(path, since)
+        if s is None:
+            return
+        start = s if start is None else max(start, s)
+
+    # substrings every matching self-contained line must contain
+    needles = []
+    if status is not None:
+        needles.append(f'"status": {json.dumps(status)}'.encode())
+    if spawned is not None:
+        needles.append(json.dumps(spawned).encode())
+
+    def matches(e):
+        sh = e["shared"]
+        if status is not None and _gate_status(sh) != status:
+            return False
+        if spawned is not None and spawned not in _spawned(sh):
+            return False
+        return where is None or bool(where(e))
+
+    shared = None
+    for raw in iter_lines(path, start):
+        if not raw.strip():
+            continue
+        m = _HEAD.match(raw)
+        if m:
+            ts, st = float(m.group(1)), int(m.group(2))
+            if (step_to is not None and st > step_to) or (until is not None and ts > until):
+                break
+        in_range = True
+        if m:
+            in_range = (start is None or st >= start) and (since is None or ts >= since)
+
+        if b'"kind": ' not in raw:
+            # legacy full-state line: no fold needed, skip cheaply when it cannot match
+            if not in_range or any(n not in raw for n in needles):
+                continue
+            try:
+                e = json.loads(raw)
+            except Exception:
+                continue
+            sh = e.get("shared") if isinstance(e.get("shared"), dict) else e.get("state")
+            if not isinstance(sh, dict):
+                continue
+            e = {"ts": e.get("ts", e.get("time")), "step": e.get("step"), "shared": sh}
+            if not m and not _in_range(e, start, since, step_to, until):
+                continue
+            if matches(e):
+                yield e
+            continue
+
+        # checkpoint/delta lines carry state forward, so they are always folded
+        try:
+            e = json.loads(raw)
+        except Exception:
+            continue
+        if e.get("kind") == "delta":
+            if shared is None:
+                continue
+            shared.update(e.get("set") or {})
+            for k in e.get("del") or ():
+                shared.pop(k, None)
+        else:
+            shared = dict(e.get("shared") or {})
+        e = {"ts": e.get("ts"), "step": e.get("step"), "shared": shared}
+        if not in_range or (not m and not _in_range(e, start, since, step_to, until)):
+            continue
+        if matches(e):
+            yield {"ts": e["ts"], "step": e["step"], "shared": dict(shared)}
+
+def _in_range(e, start, since, step_to, until):
+    st, ts = e.get("step"), e.get("ts")
+    if st is not None:
+        if (start is not None and st < start) or (step_to is not None and st > step_to):
+            return False
+    if ts is not None:
+        if (since is not None and ts < since) or (until is not None and ts > until):
+            return False
+    return True
+
+def _time(s):
+    if s is None:
+        return None
+    try:
+        return float(s)
+    except ValueError:
+        return datetime.datetime.fromisoformat(s).timestamp()
+
+def main():
+    ap = argparse.ArgumentParser(description="Stream ledger entries matching predicates as JSONL")
+    ap.add_argument("path", nargs="?", default=LEDGER_PATH)
+    ap.add_argument("--status", help="gate status, e.g. CONTRACTING")
+    ap.add_argument("--spawned", help="agent listed in _spawn, e.g. StabilizerAgent")
+    ap.add_argument("--since", help="epoch seconds or ISO time")
+    ap.add_argument("--until", help="epoch seconds or ISO time")
+    ap.add_argument("--from-step", type=int)
+    ap.add_argument("--to-step", type=int)
+    ap.add_argument("--keys", help="comma-separated shared keys to keep in the output")
+    ap.add_argument("--limit", type=int)
+    args = ap.parse_args()
+
+    keys = args.keys.split(",") if args.keys else None
+    n = 0
+    for e in query(args.path, status=args.status, spawned=args.spawned,
+                   since=_time(args.since), until=_time(args.until),
+                   step_from=args.from_step, step_to=args.to_step):
+        if keys:
+            e["shared"] = {k: e["shared"][k] for k in keys if k in e["shared"]}
+        sys.stdout.write(json.dumps(e, ensure_ascii=False) + "\n")
+        n += 1
+        if args.limit and n >= args.limit:
+            break
+
+if __name__ == "__main__":
+    main()
@@ -1,30 +1,139 @@
 import json, os
+from ledger.index import open_index, line_kind, KIND_DELTA
+from ledger.segments import sealed_segments, read_segment
 
 LEDGER_PATH = os.path.join("ledger", "log.jsonl")
 
+def _decode(lines):
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            e = json.loads(line)
+        except:
+            continue
+        yield e
+
+def _lines(path, offset=0):
+    with open(path, "rb") as f:
+        if offset:
+            f.seek(offset)
+        yield from f
+
+def _tail_lines(path, block=1 << 16):
+    # raw lines from the end of the file backwards, reading fixed-size blocks
+    with open(path, "rb") as f:
+        pos = f.seek(0, os.SEEK_END)
+        rest = b""
+        while pos > 0:
+            size = min(block, pos)
+            pos -= size
+            f.seek(pos)
+            parts = (f.read(size) + rest).split(b"\n")
+            rest = parts[0]
+            for line in reversed(parts[1:]):
+                if line.strip():
+                    yield line
+        if rest.strip():
+            yield rest
+
+def _active(path, offset=0):
+    if os.path.exists(path):
+        yield from _lines(path, offset)
+
+def iter_lines(path=LEDGER_PATH, start=None):
+    # raw (undecoded) lines: sealed segments first, then the active file.
+    # with start=k only segments ending at or after step k are decompressed;
+    # each one opens with a checkpoint, so folding can start at its first line
+    segs = sealed_segments(path)
+    if start is not None:
+        segs = [seg for seg in segs if seg["last_step"] >= start]
+        if not segs:
+            yield from _active(path, _seek_offset(path, start))
+            return
+    for seg in segs:
+        yield from read_segment(path, seg)
+    yield from _active(path)
+
+def iter_raw(path=LEDGER_PATH):
+    # ledger lines as written (delta lines are NOT materialized)
+    yield from _decode(iter_lines(path))
+
+def materialize(entries):
+    # fold delta lines onto the last checkpoint -> {"ts", "step", "shared"}
+    # legacy lines (no "kind") pass through unchanged and act as checkpoints
+    shared = None
+    for e in entries:
+        if e.get("kind") == "delta":
+            if shared is None:
+                continue  # no checkpoint seen yet, state unknown
+            shared.update(e.get("set") or {})
+            for k in e.get("del") or ():
+                shared.pop(k, None)
+            yield {"ts": e.get("ts"), "step": e.get("step"), "shared": dict(shared)}
+            continue
+        if e.get("kind") == "full":
+            shared = dict(e.get("shared") or {})
+            yield {"ts": e.get("ts"), "step": e.get("step"), "shared": dict(shared)}
+            continue
+        if isinstance(e.get("shared"), dict):
+            shared = dict(e["shared"])
+        yield e
+
 def iter_entries(path=LEDGER_PATH):
-    if not os.path.exists(path):
-        return
-    with open(path, "r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                yield json.loads(line)
-            except:
-                continue
-
-def replay_to_step(k: int, path=LEDGER_PATH):
+    yield from materialize(iter_raw(path))
+
+def _seek_offset(path, k):
+    # byte offset of the checkpoint covering the last entry with step <= k
+    idx = open_index(path) if os.path.exists(path) else None
+    if idx is None:
+        return 0
+    with idx:
+        i = idx.bisect_step(k + 1) - 1
+        if i < 0:
+            return 0
+        return idx.record(idx.checkpoint_before(i))[1]
+
+def iter_from(k: int, path=LEDGER_PATH):
+    # materialized entries with step >= k; bisect-seeks via the sidecar index
+    for e in materialize(_decode(iter_lines(path, k))):
+        if int(e.get("step", -1)) >= k:
+            yield e
+
+def replay_to_step(k: int, path=LEDGER_PATH, start=None):
     out = []
-    for e in iter_entries(path):
+    it = iter_entries(path) if start is None else iter_from(start, path)
+    for e in it:
         out.append(e)
         if int(e.get("step", -1)) >= k:
             break
     return out
 
+def state_at(k: int, path=LEDGER_PATH):
+    # reconstructed shared state as of step k (None if k precedes the ledger)
+    shared = None
+    for e in materialize(_decode(iter_lines(path, k))):
+        if int(e.get("step", -1)) > k:
+            break
+        shared = e.get("shared")
+    return shared
+
 def last_n(n: int, path=LEDGER_PATH):
-    buf = []
-    for e in iter_entries(path):
-        buf.append(e)
-    return buf[-n:]
+    if n <= 0:
+        return list(iter_entries(path))[-n:]  # keep the slice semantics of a full scan
+    # walk back until we hold n lines and reach a checkpoint to fold deltas from
+    lines, done = [], False
+    if os.path.exists(path):
+        for line in _tail_lines(path):
+            lines.append(line)
+            if len(lines) >= n and line_kind(line) != KIND_DELTA:
+                done = True
+                break
+    lines.reverse()
+    if not done:
+        # sealed segments each start with a checkpoint; pull them in newest-first
+        for seg in reversed(sealed_segments(path)):
+            lines[:0] = [line for line in read_segment(path, seg) if line.strip()]
+            if len(lines) >= n:
+                break
+    return list(materialize(_decode(lines)))[-n:]
@@ -0,0 +1,127 @@
+import os, json, gzip, lzma, shutil, argparse
+from ledger.index import open_index, build_index, index_path, REC
+
+# sealed (cold) segments live next to the active ledger:
+#   ledger.jsonl                  active segment (+ .idx)
+#   ledger.000001.jsonl.gz        sealed, compressed
+#   ledger.manifest.json          segment list with step/ts ranges
+CODECS = {
+    "gzip": (gzip.open, ".gz"),
+    "lzma": (lzma.open, ".xz"),
+}
+
+def _stem(ledger_path):
+    return ledger_path[:-len(".jsonl")] if ledger_path.endswith(".jsonl") else ledger_path
+
+def manifest_path(ledger_path):
+    return _stem(ledger_path) + ".manifest.json"
+
+def load_manifest(ledger_path):
+    p = manifest_path(ledger_path)
+    if not os.path.exists(p):
+        return {"segments": []}
+    with open(p, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def _save_manifest(ledger_path, m):
+    p = manifest_path(ledger_path)
+    tmp = p + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(m, f, indent=2)
+    os.replace(tmp, p)
+
+def sealed_segments(ledger_path):
+    return load_manifest(ledger_path)["segments"]
+
+def read_segment(ledger_path, seg):
+    # raw lines of one sealed segment (decompressed on the fly)
+    opener = CODECS[seg.get("codec", "gzip")][0]
+    p = os.path.join(os.path.dirname(ledger_path), seg["file"])
+    with opener(p, "rb") as f:
+        yield from f
+
+def seal(ledger_path, codec="gzip"):
+    # compress the active segment into the next numbered cold segment
+    if not os.path.exists(ledger_path) or not os.path.getsize(ledger_path):
+        return None
+    opener, ext = CODECS[codec]
+    if not os.path.exists(index_path(ledger_path)):
+        build_index(ledger_path)
+    with open_index(ledger_path) as idx:
+        if not len(idx):
+            return None
+        first, last, entries = idx.record(0), idx.record(len(idx) - 1), len(idx)
+
+    m = load_manifest(ledger_path)
+    name = f"{os.path.basename(_stem(ledger_path))}.{len(m['segments']) + 1:06d}.jsonl{ext}"
+    dst = os.path.join(os.path.dirname(ledger_path), name)
+    with open(ledger_path, "rb") as src, opener(dst + ".tmp", "wb") as out:
+        shutil.copyfileobj(src, out)
+    os.replace(dst + ".tmp", dst)
+
+    seg = {
+        "file": name,
+        "codec": codec,
+        "first_step": first[0],
+        "last_step": last[0],
+        "first_ts": first[3],
+        "last_ts": last[3],
+        "entries": entries,
+        "raw_bytes": os.path.getsize(ledger_path),
+        "bytes": os.path.getsize(dst),
+    }
+    m["segments"].append(seg)
+    _save_manifest(ledger_path, m)
+    os.remove(ledger_path)
+    os.remove(index_path(ledger_path))
+    return seg
+
+def truncate_after(ledger_path, step):
+    # drop every entry with step > `step`, sealed segments included, so a
+    # resumed run can append from there. a sealed segment that straddles the
+    # cut is decompressed back into the active file first
+    m = load_manifest(ledger_path)
+    segs = m["segments"]
+    changed = False
+    while segs and segs[-1]["first_step"] > step:
+        os.remove(os.path.join(os.path.dirname(ledger_path), segs.pop()["file"]))
+        changed = True
+    if segs and segs[-1]["last_step"] > step:
+        seg = segs.pop()
+        for p in (ledger_path, index_path(ledger_path)):
+            if os.path.exists(p):
+                os.remove(p)   # everything in it is newer than the cut
+        with open(ledger_path + ".tmp", "wb") as out:
+            for raw in read_segment(ledger_path, seg):
+                out.write(raw)
+        os.replace(ledger_path + ".tmp", ledger_path)
+        os.remove(os.path.join(os.path.dirname(ledger_path), seg["file"]))
+        build_index(ledger_path)
+        changed = True
+    if changed:
+        _save_manifest(ledger_path, m)
+    if not os.path.exists(ledger_path):
+        return
+    if not os.path.exists(index_path(ledger_path)):
+        build_index(ledger_path)
+    with open_index(ledger_path) as idx:
+        i = idx.bisect_step(step + 1)
+        cut = idx.record(i)[1] if i < len(idx) else None
+    if cut is not None:
+        with open(ledger_path, "r+b") as f:
+            f.truncate(cut)
+        with open(index_path(ledger_path), "r+b") as f:
+            f.truncate(i * REC.size)
+
+def main():
+    ap = argparse.ArgumentParser(description="Seal active ledger files into compressed segments")
+    ap.add_argument("paths", nargs="+")
+    ap.add_argument("--codec", default="gzip", choices=sorted(CODECS))
+    args = ap.parse_args()
+    for p in args.paths:
+        seg = seal(p, codec=args.codec)
+        if seg:
+            print("✔ SEALED:", p, "->", seg["file"], f"{seg['raw_bytes']} -> {seg['bytes']} bytes")
+
+if __name__ == "__main__":
+    main()
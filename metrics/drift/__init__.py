@@ -1,7 +1,15 @@
-﻿def compute_drift(prev, curr):
+﻿_MISSING = object()
+
+def compute_drift(prev, curr, changed=None):
     # Small, deterministic drift signal for now (upgrade later)
     if not prev:
         return 0.0
+    if changed is not None:
+        # prev == curr outside `changed`: only the touched keys can differ
+        for k in changed:
+            if prev.get(k, _MISSING) != curr.get(k, _MISSING):
+                return 0.1
+        return 0.0
     if prev == curr:
         return 0.0
     return 0.1
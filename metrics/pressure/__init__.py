@@ -1,6 +1,10 @@
 ﻿def compute_pressure(state):
+    shared = getattr(state, 'shared', {})
+    if hasattr(shared, 'size_estimate'):
+        # TrackedDict keeps len(str(shared)) current on every write
+        return shared.size_estimate() / 1000.0
     try:
-        size = len(str(getattr(state, 'shared', {})))
+        size = len(str(shared))
     except Exception:
         size = 1
     return size / 1000.0
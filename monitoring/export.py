@@ -1,11 +1,29 @@
 import os, json, time
+from ledger.columns import has_columns, load_columns, spawned_from_mask, STATUS
 
-def export_run_artifacts(run_dir: str, entries: list):
+def _series_from_columns(run_dir):
+    # same rows as the ledger path, straight from the typed column arrays
+    c = load_columns(run_dir)
+    status = [STATUS[s] if 0 <= s < len(STATUS) else None for s in c["status"]]
+    return [{
+        "ts": float(c["ts"][i]),
+        "step": int(c["step"][i]),
+        "alpha": float(c["alpha"][i]),
+        "alpha_eff": float(c["alpha_eff"][i]),
+        "gate_status": status[i],
+        "spawned": spawned_from_mask(int(c["spawn"][i])) or None,
+    } for i in range(len(c["step"]))]
+
+def export_run_artifacts(run_dir: str, entries: list = None):
     os.makedirs(run_dir, exist_ok=True)
 
+    # without entries, read the columnar store written alongside the ledger
+    if entries is None and has_columns(run_dir):
+        return _write_artifacts(run_dir, _series_from_columns(run_dir))
+
     # Build stability series from entries (best-effort)
     series = []
-    for e in entries:
+    for e in entries or []:
         shared = e.get("shared", {}) or {}
         gate = shared.get("_gate", {}) or {}
         spawn = shared.get("_spawn", {}) or {}
@@ -18,7 +36,9 @@ def export_run_artifacts(run_dir: str, entries: list):
             "gate_status": gate.get("status"),
             "spawned": (spawn.get("agents") if isinstance(spawn, dict) else None),
         })
+    return _write_artifacts(run_dir, series)
 
+def _write_artifacts(run_dir, series):
     with open(os.path.join(run_dir, "stability_series.json"), "w", encoding="utf-8") as f:
         json.dump(series, f, indent=2)
 
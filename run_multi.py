@@ -0,0 +1,174 @@
+import os, sys, json, time, argparse, contextlib, traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from runtime.shm_channel import MetricBoard, publish_manifest, np
+from ledger.columns import SPAWN_BITS
+
+# runs independent swarms (one per repo or config entry) in a process pool.
+# every swarm gets runs/multi_<ts>/<NN>_<name>/ as its run dir, its output
+# goes to stdout.log there, and summary.json/summary.md aggregate them all.
+# per-step metrics come back through a shared-memory MetricBoard (one slot
+# per swarm) and are gathered in a single pass; --share-manifests scans each
+# distinct root once and hands the manifest to its swarms the same way.
+#   python run_multi.py repoA repoB --workers 4 -- --mode active --steps 20
+#   python run_multi.py --config swarms.json
+# swarms.json: [{"name": "a", "root": "../repoA", "args": ["--mode", "lab"]}, ...]
+
+def _workers(n):
+    return max(1, n or min(4, os.cpu_count() or 1))
+
+def _specs(args, passthrough):
+    specs = []
+    if args.config:
+        with open(args.config, "r", encoding="utf-8") as f:
+            for c in json.load(f):
+                specs.append({"name": c.get("name") or os.path.basename(os.path.abspath(c.get("root", "."))),
+                              "root": c.get("root", "."),
+                              "args": list(c.get("args") or passthrough)})
+    for r in args.repos:
+        specs.append({"name": os.path.basename(os.path.abspath(r)), "root": r, "args": list(passthrough)})
+    return specs
+
+def _run_one(spec):
+    # worker process: one swarm, stdout captured next to its artifacts
+    import run_swarm
+    rd = spec["run_dir"]
+    os.makedirs(rd, exist_ok=True)
+    out = {"name": spec["name"], "root": os.path.abspath(spec["root"]), "run_dir": rd, "ok": True}
+    t0 = time.perf_counter()
+    with open(os.path.join(rd, "stdout.log"), "w", encoding="utf-8") as log, contextlib.redirect_stdout(log):
+        try:
+            run_swarm.main(spec["args"] + ["--run-dir", rd, "--root", spec["root"]])
+        except Exception:
+            out["ok"] = False
+            out["error"] = traceback.format_exc(limit=3).strip().splitlines()[-1]
+            traceback.print_exc(file=log)
+    out["wall_s"] = round(time.perf_counter() - t0, 4)
+
+    mon = os.path.join(rd, "monitor.json")
+    if os.path.exists(mon):
+        with open(mon, "r", encoding="utf-8") as f:
+            m = json.load(f)
+        gate = m.get("shared", {}).get("_gate") or {}
+        out["steps"] = m.get("step", 0)
+        out["gate"] = gate.get("status")
+        out["alpha_eff"] = gate.get("alpha_eff")
+        out["termination"] = (m.get("termination") or {}).get("reason")
+    steps = out.get("steps") or 0
+    out["steps_per_s"] = round(steps / out["wall_s"], 2) if out["wall_s"] > 0 else None
+    return out
+
+def board_stats(rows):
+    # rows: one slot of MetricBoard.gather()
+    if np is not None:
+        n = len(rows)
+        if not n:
+            return {"rows": 0}
+        return {"rows": n,
+                "contracting_steps": int((rows["status"] == 1).sum()),
+                "spawn_counts": {a: int(((rows["spawn"] & bit) != 0).sum()) for a, bit in SPAWN_BITS.items()},
+                "pressure_mean": round(float(rows["pressure"].mean()), 6),
+                "alpha_eff_max": round(float(rows["alpha_eff"].max()), 6)}
+    if not rows:
+        return {"rows": 0}
+    return {"rows": len(rows),
+            "contracting_steps": sum(1 for r in rows if r["status"] == 1),
+            "spawn_counts": {a: sum(1 for r in rows if r["spawn"] & bit) for a, bit in SPAWN_BITS.items()},
+            "pressure_mean": round(sum(r["pressure"] for r in rows) / len(rows), 6),
+            "alpha_eff_max": round(max(r["alpha_eff"] for r in rows), 6)}
+
+def summarize(results, wall_s):
+    ok = [r for r in results if r["ok"]]
+    gates = {}
+    for r in ok:
+        gates[r.get("gate") or "UNKNOWN"] = gates.get(r.get("gate") or "UNKNOWN", 0) + 1
+    steps = sum(r.get("steps") or 0 for r in ok)
+    return {
+        "swarms": len(results),
+        "failed": len(results) - len(ok),
+        "wall_s": round(wall_s, 4),
+        "swarm_wall_s": round(sum(r["wall_s"] for r in results), 4),
+        "steps": steps,
+        "steps_per_s": round(steps / wall_s, 2) if wall_s > 0 else None,
+        "gate_outcomes": gates,
+        "contracting_steps": sum(r.get("contracting_steps", 0) for r in ok),
+        "swarms_detail": results,
+    }
+
+def write_summary(out_dir, summary):
+    with open(os.path.join(out_dir, "summary.json"), "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2)
+    lines = [
+        "# RLM Multi-Swarm Summary",
+        "",
+        f"- Swarms: {summary['swarms']} ({summary['failed']} failed)",
+        f"- Wall time: {summary['wall_s']} s (sum of swarms: {summary['swarm_wall_s']} s)",
+        f"- Steps: {summary['steps']} ({summary['steps_per_s']} steps/s overall)",
+        f"- Gate outcomes: {', '.join(f'{k}={v}' for k, v in sorted(summary['gate_outcomes'].items())) or '-'}",
+        "",
+        "| swarm | gate | steps | wall s | steps/s | contracting | stop | run dir |",
+        "| ----- | ---- | ----- | ------ | ------- | ----------- | ---- | ------- |",
+    ]
+    for r in summary["swarms_detail"]:
+        gate = r.get("gate") if r["ok"] else "ERROR: " + r.get("error", "")
+        lines.append(f"| {r['name']} | {gate} | {r.get('steps', '-')} | {r['wall_s']} | {r.get('steps_per_s', '-')} "
+                     f"| {r.get('contracting_steps', '-')} | {r.get('termination') or '-'} | {r['run_dir']} |")
+    with open(os.path.join(out_dir, "summary.md"), "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+
+def run_many(specs, workers=None, out_dir=None, share_manifests=False, board_capacity=4096):
+    out_dir = out_dir or os.path.join("runs", time.strftime("multi_%Y%m%d_%H%M%S"))
+    os.makedirs(out_dir, exist_ok=True)
+    t0 = time.perf_counter()
+    board = MetricBoard.create(len(specs), board_capacity)
+    manifests = {}
+    try:
+        for i, s in enumerate(specs):
+            s["run_dir"] = os.path.join(out_dir, f"{i:02d}_{s['name']}")
+            s["args"] = s["args"] + ["--metrics-shm", board.name, "--metrics-slot", str(i)]
+            if share_manifests:
+                from tools.active_artifacts import repo_tree
+                root = os.path.abspath(s["root"])
+                if root not in manifests:
+                    manifests[root] = publish_manifest(repo_tree(root))
+                s["args"] += ["--manifest-shm", manifests[root].name]
+        results = [None] * len(specs)
+        with ProcessPoolExecutor(max_workers=_workers(workers)) as pool:
+            futs = {pool.submit(_run_one, s): i for i, s in enumerate(specs)}
+            for f in as_completed(futs):
+                r = results[futs[f]] = f.result()
+                print("✔ SWARM:" if r["ok"] else "✖ SWARM:", r["name"], r.get("gate"), r.get("steps"), "steps", r["wall_s"], "s")
+        rows = board.gather()
+        for i, r in enumerate(results):
+            r.update(board_stats(rows[i]))
+        del rows
+    finally:
+        board.close()
+        for m in manifests.values():
+            m.close()
+    summary = summarize(results, time.perf_counter() - t0)
+    write_summary(out_dir, summary)
+    return out_dir, summary
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    passthrough = []
+    if "--" in argv:
+        i = argv.index("--")
+        argv, passthrough = argv[:i], argv[i+1:]
+    ap = argparse.ArgumentParser(description="Run independent swarms in a process pool")
+    ap.add_argument("repos", nargs="*", help="repo roots, one swarm each")
+    ap.add_argument("--config", help="JSON list of {name, root, args}")
+    ap.add_argument("--workers", type=int, help="max concurrent swarms (default min(4, cpus))")
+    ap.add_argument("--out", help="output dir (default runs/multi_<ts>)")
+    ap.add_argument("--share-manifests", action="store_true", help="scan each root once and share it via shared memory")
+    ap.add_argument("--board-capacity", type=int, default=4096, help="metric rows kept per swarm")
+    args = ap.parse_args(argv)
+    specs = _specs(args, passthrough)
+    if not specs:
+        ap.error("no repos or --config given")
+    out_dir, summary = run_many(specs, args.workers, args.out, args.share_manifests, args.board_capacity)
+    print("SWARMS:", summary["swarms"], "FAILED:", summary["failed"], "WALL:", summary["wall_s"], "s")
+    print("✔ MULTI COMPLETE:", out_dir)
+
+if __name__ == "__main__":
+    main()
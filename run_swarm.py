@@ -1,23 +1,33 @@
 ﻿import sys, os, json, time
 from runtime.swarm_state.swarm_state import SwarmState
-from engine.execution.executor import step
-from ledger.ledger import write_entry
+from engine.execution import executor
+from engine.execution.executor import step, inv
+from engine.execution.convergence import Convergence, PATIENCE, VOLATILE
+from metrics.pressure import compute_pressure
+from ledger.ledger import LedgerWriter, CHECKPOINT_EVERY
+from ledger.columns import ColumnWriter, status_code, spawn_mask, row_count, truncate_columns
+from ledger.segments import truncate_after
+from runtime.checkpoint import save_checkpoint, load_checkpoint, CHECKPOINT_EVERY
+from tools.topology_memory import flush as flush_memory, discard_pending, manual_checkpoints
+
+_argv = sys.argv  # main(argv) swaps this for in-process runs (see run_multi.py)
 
 def _run_dir():
-    ts = time.strftime("run_%Y%m%d_%H%M%S")
-    d = os.path.join("runs", ts)
+    d = _arg("--run-dir", None)
+    if d is None:
+        d = os.path.join("runs", time.strftime("run_%Y%m%d_%H%M%S"))
     os.makedirs(d, exist_ok=True)
     return d
 
 def _arg(name, default=None):
-    if name in sys.argv:
-        i = sys.argv.index(name)
-        if i+1 < len(sys.argv):
-            return sys.argv[i+1]
+    if name in _argv:
+        i = _argv.index(name)
+        if i+1 < len(_argv):
+            return _argv[i+1]
     return default
 
 def _has(flag):
-    return flag in sys.argv
+    return flag in _argv
 
 def _mode():
     return _arg("--mode", "lab")
@@ -26,17 +36,81 @@ def _steps():
     s = _arg("--steps", None)
     return int(s) if s is not None else None
 
-def main():
+def _ledger_writer(run_dir):
+    fmt = _arg("--ledger-format", "full")
+    every = int(_arg("--checkpoint-every", CHECKPOINT_EVERY))
+    rotate_bytes = _arg("--rotate-bytes", None)
+    rotate_steps = _arg("--rotate-steps", None)
+    return LedgerWriter(run_dir, fmt=fmt, checkpoint_every=every,
+                        rotate_bytes=int(rotate_bytes) if rotate_bytes else None,
+                        rotate_steps=int(rotate_steps) if rotate_steps else None,
+                        codec=_arg("--ledger-codec", "gzip"))
+
+def _strip(args, *flags):
+    # args without the given "--flag value" pairs
+    out, skip = [], False
+    for a in args:
+        if skip:
+            skip = False
+        elif a in flags:
+            skip = True
+        else:
+            out.append(a)
+    return out
+
+def _save_state(run_dir, state, cols, conv):
+    # everything up to state.step reaches disk first, the checkpoint last
+    cols.flush()
+    flush_memory()
+    save_checkpoint(run_dir, {
+        "step": state.step,
+        "shared": state.as_dict(),
+        "metrics": state.metrics,
+        "argv": _strip(_argv[1:], "--resume", "--run-dir"),
+        "columns_rows": row_count(run_dir),
+        "convergence": conv.history() if conv is not None else [],
+    })
+
+def _loop(state, start, steps, mode, ledger, cols, conv, board, slot, run_dir, save_every):
+    for i in range(start, steps):
+        step(state, mode=mode)
+        ledger.write(state.step, state.shared)
+        cols.append(state.step, state.gate.as_dict(), **state.metrics)
+        if board is not None:
+            m = state.metrics
+            board.append(slot, state.step, m["drift"], m["pressure"], state.gate.alpha_eff, m["horizon"],
+                         status_code(state.gate.status), spawn_mask(m["spawned"]))
+        print("STEP", i)
+        if conv is not None and conv.observe(state.step, inv.fingerprint(state.shared, exclude=VOLATILE), state.gate.status):
+            print("✔ CONVERGED:", conv.reason, "period", conv.period, "at step", state.step, "of", steps)
+            break
+        if save_every > 0 and state.step % save_every == 0:
+            _save_state(run_dir, state, cols, conv)
+
+def main(argv=None):
+    # argv: run_swarm arguments without the program name; returns the run dir
+    global _argv
+    if argv is not None:
+        _argv = [sys.argv[0]] + list(argv)
+    ckpt = None
+    if _arg("--resume", None):
+        # same run dir and arguments as the original run; flags given now win
+        resume_dir = _arg("--resume")
+        ckpt = load_checkpoint(resume_dir)
+        if ckpt is None:
+            print("ERROR: no checkpoint in", resume_dir)
+            return None
+        _argv = _argv + ["--run-dir", resume_dir] + ckpt["argv"]
     mode = _mode()
     run_dir = _run_dir()
     apply = _has("--apply")
 
     # WATCH MODE: scan repos + write artifacts; AUTO can APPLY safe changes
-    if "--watch" in sys.argv:
+    if "--watch" in _argv:
         root = _arg("--watch", None)
         if not root:
             print("ERROR: --watch requires a directory path")
-            return
+            return None
 
         from tools.watch_scan import watch_repos
         report = watch_repos(root)
@@ -76,31 +150,77 @@ def main():
                 })
 
         print("✔ RUN COMPLETE:", run_dir)
-        return
+        return run_dir
 
     # SWARM LOOP
     state = SwarmState()
+    inv.verify = _has("--verify-fingerprint")
+    reactive = _has("--reactive")
+    executor.configure(parallel=not _has("--serial-agents"), reactive=reactive,
+                       memoize=_has("--memoize"), memo_size=int(_arg("--memo-size", 256)))
     steps = _steps()
     if steps is None:
         steps = 10 if mode in ("lab","active") else 50
+    ledger = _ledger_writer(run_dir)
+    cols = ColumnWriter(run_dir)
+    conv = None if _has("--no-converge") else Convergence(
+        patience=int(_arg("--converge-patience", PATIENCE)), cycles=not _has("--no-cycles"))
 
-    for i in range(steps):
-        state = step(state, mode=mode)
-        write_entry(run_dir, state.step, state.shared)
-        print("STEP", i)
+    start = 0
+    if ckpt is not None:
+        state.step = ckpt["step"]
+        state.shared = ckpt["shared"]
+        state.metrics = ckpt["metrics"]
+        executor.resume(state)
+        truncate_after(ledger.path, state.step)
+        truncate_columns(run_dir, ckpt["columns_rows"])
+        if conv is not None:
+            conv.restore(ckpt["convergence"])
+        start = state.step
+        print("✔ RESUMED:", run_dir, "at step", start)
+    save_every = int(_arg("--checkpoint-state-every", CHECKPOINT_EVERY))
+    if save_every > 0:
+        manual_checkpoints()
+
+    # per-step metric rows for a run_multi coordinator (shared memory, no pickling)
+    board, slot = None, int(_arg("--metrics-slot", 0))
+    if _arg("--metrics-shm", None):
+        from runtime.shm_channel import MetricBoard
+        board = MetricBoard.attach(_arg("--metrics-shm"))
+
+    try:
+        _loop(state, start, steps, mode, ledger, cols, conv, board, slot, run_dir, save_every)
+    except BaseException:
+        if save_every > 0:
+            discard_pending()   # resume redoes these steps; don't count them twice
+        raise
+    if save_every > 0:
+        _save_state(run_dir, state, cols, conv)
+    cols.flush()
+    flush_memory()
+    if board is not None:
+        board.close()
+    if reactive:
+        print("✔ REACTIVE: agents run", executor.core.ran + executor.spawner.ran,
+              "skipped", executor.core.skipped + executor.spawner.skipped, "idle steps", executor.idle_steps)
+    if executor.core.memo is not None:
+        print("✔ MEMO: hits", executor.core.memo.hits, "misses", executor.core.memo.misses)
 
     # ACTIVE/AUTO artifacts for this repo after run
     if mode in ("active","auto"):
         from tools.active_artifacts import repo_tree, quick_hash, write_summary_md, write_patch_proposals, write_restructure_plan
-        root = os.path.abspath(".")
-        items = repo_tree(root)
+        root = os.path.abspath(_arg("--root", "."))
+        if _arg("--manifest-shm", None):
+            # scan published once by run_multi for every swarm on this root
+            from runtime.shm_channel import Manifest
+            with Manifest.attach(_arg("--manifest-shm")) as man:
+                items = list(man)
+        else:
+            items = repo_tree(root)
         fp = quick_hash(root, items)
 
         drift = float(state.shared.get("_spawn", {}).get("reason", {}).get("drift", 0.0)) if isinstance(state.shared.get("_spawn", {}), dict) else 0.0
-        try:
-            pressure = len(str(state.shared))/1000.0
-        except Exception:
-            pressure = 0.0
+        pressure = compute_pressure(state)
 
         gate_status = state.shared.get("_gate", {}).get("status", "OK")
         spawned = state.shared.get("_spawn", {}).get("agents", []) if isinstance(state.shared.get("_spawn", {}), dict) else []
@@ -129,9 +249,13 @@ def main():
     # Final monitor artifact
     outp = os.path.join(run_dir, "monitor.json")
     with open(outp, "w", encoding="utf-8") as f:
-        json.dump({"step": state.step, "shared": state.shared}, f, indent=2)
+        monitor = {"step": state.step, "shared": state.as_dict()}
+        if conv is not None:
+            monitor["termination"] = conv.as_dict(state.step, steps)
+        json.dump(monitor, f, indent=2)
 
     print("✔ RUN COMPLETE:", run_dir)
+    return run_dir
 
 if __name__ == "__main__":
     main()
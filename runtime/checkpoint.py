@@ -0,0 +1,31 @@
+import os, json
+
+# <run_dir>/checkpoint.json: the latest resumable point of a swarm run.
+#   step, shared, metrics   SwarmState after that step
+#   argv                    run_swarm arguments of the original run
+#   columns_rows            rows in the columns store at that step
+#   convergence             Convergence history window
+# memory/topology are flushed right before it is written, so they also stand
+# exactly at `step`
+CHECKPOINT_NAME = "checkpoint.json"
+CHECKPOINT_EVERY = 10
+
+def checkpoint_path(run_dir):
+    return os.path.join(run_dir, CHECKPOINT_NAME)
+
+def save_checkpoint(run_dir, data):
+    p = checkpoint_path(run_dir)
+    tmp = p + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, p)
+
+def load_checkpoint(run_dir):
+    # None when the run never checkpointed
+    p = checkpoint_path(run_dir)
+    if not os.path.exists(p):
+        return None
+    with open(p, "r", encoding="utf-8") as f:
+        return json.load(f)
@@ -0,0 +1,182 @@
+import struct
+from multiprocessing import shared_memory
+
+try:
+    import numpy as np
+except ImportError:  # struct/memoryview fallback
+    np = None
+
+# shared-memory transport between the multi-swarm coordinator and workers.
+# blocks are little-endian, 8-byte aligned and read in place: no pickling,
+# no JSON, numeric columns are memoryview casts (or np.frombuffer views).
+#
+# manifest block (repo_tree items: {"path", "bytes"}):
+#   header  "<4sHHQQ"  magic b"RLMM", version, 0, count, heap_len
+#   sizes   int64[count]
+#   offsets uint64[count + 1]     path i = heap[offsets[i]:offsets[i+1]]
+#   heap    utf-8 paths
+#
+# metric board (one slot per worker, one row per step, single writer per slot):
+#   header  "<4sHHQQ"  magic b"RLMB", version, 0, slots, capacity
+#   counts  uint64[slots]         rows published per slot
+#   rows    slots * capacity * ROW
+ROW = struct.Struct("<qdddd4xbB2x")   # step, drift, pressure, alpha_eff, horizon, status, spawn mask
+ROW_FIELDS = ("step", "drift", "pressure", "alpha_eff", "horizon", "status", "spawn")
+_HEAD = struct.Struct("<4sHHQQ")
+_VERSION = 1
+
+def _attach(name):
+    # the creator owns (and unlinks) the block; readers never do. before 3.13
+    # attaching also registers with the resource tracker, which pool workers
+    # share with the coordinator, so the creator's unlink still balances it
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:  # Python < 3.13
+        return shared_memory.SharedMemory(name=name)
+
+class _Block:
+    def __init__(self, shm, owner):
+        self.shm = shm
+        self.owner = owner
+        self._views = []
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def _view(self, start, stop, fmt):
+        v = self.shm.buf[start:stop].cast(fmt)
+        self._views.append(v)
+        return v
+
+    def close(self):
+        # exported views must be released before the mapping can close
+        for v in self._views:
+            v.release()
+        self._views = []
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+    def __del__(self):
+        for v in self._views:
+            v.release()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+class Manifest(_Block):
+    # read-only view over a published manifest; paths decode one at a time
+    def __init__(self, shm, owner=False):
+        super().__init__(shm, owner)
+        magic, ver, _, n, heap = _HEAD.unpack_from(shm.buf, 0)
+        if magic != b"RLMM" or ver != _VERSION:
+            raise ValueError(f"not a manifest block: {shm.name}")
+        self.count = n
+        o = _HEAD.size
+        self.sizes = self._view(o, o + 8 * n, "q")
+        o += 8 * n
+        self.offsets = self._view(o, o + 8 * (n + 1), "Q")
+        o += 8 * (n + 1)
+        self.heap = self._view(o, o + heap, "B")
+
+    @classmethod
+    def attach(cls, name):
+        return cls(_attach(name))
+
+    def __len__(self):
+        return self.count
+
+    def path(self, i):
+        return bytes(self.heap[self.offsets[i]:self.offsets[i + 1]]).decode("utf-8")
+
+    def __getitem__(self, i):
+        return {"path": self.path(i), "bytes": self.sizes[i]}
+
+    def __iter__(self):
+        for i in range(self.count):
+            yield self[i]
+
+    def total_bytes(self):
+        if np is not None:
+            return int(np.frombuffer(self.sizes, dtype="<i8").clip(min=0).sum())
+        return sum(s for s in self.sizes if s > 0)
+
+def publish_manifest(items):
+    # creator side: copy items into a new block once; returns an owning Manifest
+    paths = [it["path"].encode("utf-8", "surrogateescape") for it in items]
+    heap = b"".join(paths)
+    n = len(paths)
+    size = _HEAD.size + 8 * n + 8 * (n + 1) + len(heap)
+    shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+    buf = shm.buf
+    _HEAD.pack_into(buf, 0, b"RLMM", _VERSION, 0, n, len(heap))
+    o = _HEAD.size
+    struct.pack_into(f"<{n}q", buf, o, *(int(it["bytes"]) for it in items))
+    o += 8 * n
+    offs, at = [], 0
+    for p in paths:
+        offs.append(at)
+        at += len(p)
+    offs.append(at)
+    struct.pack_into(f"<{n + 1}Q", buf, o, *offs)
+    o += 8 * (n + 1)
+    buf[o:o + len(heap)] = heap
+    return Manifest(shm, owner=True)
+
+class MetricBoard(_Block):
+    def __init__(self, shm, owner=False):
+        super().__init__(shm, owner)
+        magic, ver, _, slots, cap = _HEAD.unpack_from(shm.buf, 0)
+        if magic != b"RLMB" or ver != _VERSION:
+            raise ValueError(f"not a metric board: {shm.name}")
+        self.slots, self.capacity = slots, cap
+        self.counts = self._view(_HEAD.size, _HEAD.size + 8 * slots, "Q")
+        self._rows_at = _HEAD.size + 8 * slots
+
+    @classmethod
+    def create(cls, slots, capacity=4096):
+        size = _HEAD.size + 8 * slots + slots * capacity * ROW.size
+        shm = shared_memory.SharedMemory(create=True, size=size)
+        _HEAD.pack_into(shm.buf, 0, b"RLMB", _VERSION, 0, slots, capacity)
+        struct.pack_into(f"<{slots}Q", shm.buf, _HEAD.size, *([0] * slots))
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name):
+        return cls(_attach(name))
+
+    def append(self, slot, step, drift, pressure, alpha_eff, horizon, status=-1, spawn=0):
+        # writer side: fill the row, then publish it by bumping the count.
+        # rows past capacity are dropped (count stops at capacity)
+        n = self.counts[slot]
+        if n >= self.capacity:
+            return False
+        ROW.pack_into(self.shm.buf, self._rows_at + (slot * self.capacity + n) * ROW.size,
+                      int(step), float(drift), float(pressure), float(alpha_eff), float(horizon),
+                      int(status), int(spawn))
+        self.counts[slot] = n + 1
+        return True
+
+    def gather(self):
+        # coordinator side, one pass over the board: slot -> rows. with numpy the
+        # rows are a structured array viewing the shared buffer (no copy); drop
+        # them before close()
+        out = {}
+        for s in range(self.slots):
+            n = self.counts[s]
+            start = self._rows_at + s * self.capacity * ROW.size
+            if np is not None:
+                out[s] = np.frombuffer(self.shm.buf, dtype=ROW_DTYPE, count=n, offset=start)
+            else:
+                out[s] = [dict(zip(ROW_FIELDS, r))
+                          for r in ROW.iter_unpack(self.shm.buf[start:start + n * ROW.size])]
+        return out
+
+ROW_DTYPE = np.dtype({"names": list(ROW_FIELDS),
+                      "formats": ["<i8", "<f8", "<f8", "<f8", "<f8", "i1", "u1"],
+                      "offsets": [0, 8, 16, 24, 32, 44, 45],
+                      "itemsize": ROW.size}) if np is not None else None
@@ -1,4 +1,263 @@
+import threading
+from collections.abc import MutableMapping
+
+_MISSING = object()
+_ATOMS = (str, int, float, bool, bytes, type(None))
+
+def _same(old, v):
+    # an equal value of the same type is not a change. re-assigning the very
+    # same mutable object still counts: it may have been mutated in place
+    if type(old) is not type(v) or old != v:
+        return False
+    return old is not v or isinstance(v, _ATOMS)
+
+class TrackedDict(dict):
+    # dict that records which keys were set/deleted and keeps len(str(self))
+    # up to date per write. values are assumed to be replaced, not mutated in
+    # place (agents assign whole values), so per-key sizes stay exact.
+    # writes of an equal value are stored but not reported as changes.
+    # writes are serialized so agents on different keys may run concurrently
+    def __init__(self, *args, **kwargs):
+        super().__init__()
+        self._lock = threading.Lock()
+        self._sizes = {}    # key -> len("k: v") as rendered by str(dict)
+        self._total = 0
+        self._subs = []     # sets receiving every touched key
+        self.dirty = self.subscribe()
+        self.update(*args, **kwargs)
+
+    def _touch(self, k):
+        for s in self._subs:
+            s.add(k)
+
+    def _drop(self, k):
+        self._total -= self._sizes.pop(k, 0)
+        self._touch(k)
+
+    def __setitem__(self, k, v):
+        if _same(self.get(k, _MISSING), v):
+            super().__setitem__(k, v)
+            return
+        n = len(repr(k)) + 2 + len(repr(v))
+        with self._lock:
+            super().__setitem__(k, v)
+            self._total += n - self._sizes.get(k, 0)
+            self._sizes[k] = n
+            self._touch(k)
+
+    def __delitem__(self, k):
+        with self._lock:
+            super().__delitem__(k)
+            self._drop(k)
+
+    def pop(self, k, *default):
+        with self._lock:
+            had = k in self
+            v = super().pop(k, *default)
+            if had:
+                self._drop(k)
+        return v
+
+    def popitem(self):
+        with self._lock:
+            k, v = super().popitem()
+            self._drop(k)
+        return k, v
+
+    def setdefault(self, k, default=None):
+        if k not in self:
+            self[k] = default
+        return self[k]
+
+    def update(self, *args, **kwargs):
+        for k, v in dict(*args, **kwargs).items():
+            self[k] = v
+
+    def clear(self):
+        for k in list(self):
+            del self[k]
+
+    def subscribe(self):
+        # independent change feed: the returned set collects touched keys
+        # until its owner clears it
+        s = set()
+        self._subs.append(s)
+        return s
+
+    def unsubscribe(self, s):
+        self._subs = [x for x in self._subs if x is not s]
+
+    def size_estimate(self):
+        # == len(str(self)) without rendering the dict
+        n = len(self)
+        return 2 + self._total + 2 * (n - 1) if n else 2
+
+class Gate:
+    __slots__ = ("alpha", "alpha_eff", "status")
+
+    def __init__(self, alpha, alpha_eff, status):
+        self.alpha = alpha
+        self.alpha_eff = alpha_eff
+        self.status = status
+
+    def as_dict(self):
+        return {"alpha": self.alpha, "alpha_eff": self.alpha_eff, "status": self.status}
+
+    def __eq__(self, other):
+        return type(other) is type(self) and self.as_dict() == other.as_dict()
+
+    @classmethod
+    def from_dict(cls, d):
+        # None when d carries anything the typed field cannot hold losslessly
+        if list(d) != ["alpha", "alpha_eff", "status"]:
+            return None
+        return cls(d["alpha"], d["alpha_eff"], d["status"])
+
+class Spawn:
+    __slots__ = ("agents", "drift", "pressure")
+
+    def __init__(self, agents, drift, pressure):
+        self.agents = agents
+        self.drift = drift
+        self.pressure = pressure
+
+    def as_dict(self):
+        return {"agents": self.agents, "reason": {"drift": self.drift, "pressure": self.pressure}}
+
+    def __eq__(self, other):
+        return type(other) is type(self) and self.as_dict() == other.as_dict()
+
+    @classmethod
+    def from_dict(cls, d):
+        r = d.get("reason")
+        if list(d) != ["agents", "reason"] or not isinstance(r, dict) or list(r) != ["drift", "pressure"]:
+            return None
+        return cls(d["agents"], r["drift"], r["pressure"])
+
+# control-plane keys of the legacy shared dict -> SwarmState slot (+ typed class)
+CONTROL = {
+    "plan": ("_plan", None),
+    "exec": ("_exec", None),
+    "fingerprint": ("_fingerprint", None),
+    "_gate": ("_gate", Gate),
+    "_spawn": ("_spawn", Spawn),
+}
+
+class SharedView(MutableMapping):
+    # state.shared compatibility view: control keys live in typed SwarmState
+    # slots, everything else in the payload TrackedDict. dirty feeds and the
+    # str() size estimate cover both
+    __slots__ = ("_state", "_payload", "_csizes", "__weakref__")
+
+    def __init__(self, state, payload):
+        self._state = state
+        self._payload = payload
+        self._csizes = {}   # present control key -> rendered size
+
+    def __getitem__(self, k):
+        ctl = CONTROL.get(k)
+        if ctl is None:
+            return self._payload[k]
+        v = getattr(self._state, ctl[0])
+        if v is None:
+            raise KeyError(k)
+        return v.as_dict() if hasattr(v, "as_dict") else v
+
+    def __setitem__(self, k, v):
+        ctl = CONTROL.get(k)
+        if ctl is None:
+            self._payload[k] = v
+            return
+        slot, typ = ctl
+        if typ is not None and isinstance(v, dict):
+            v = typ.from_dict(v) or v   # keep odd-shaped dicts verbatim
+        if _same(getattr(self._state, slot), v):
+            setattr(self._state, slot, v)
+            return
+        n = len(repr(k)) + 2 + len(repr(v.as_dict() if hasattr(v, "as_dict") else v))
+        with self._payload._lock:
+            setattr(self._state, slot, v)
+            self._csizes[k] = n
+            self._payload._touch(k)
+
+    def __delitem__(self, k):
+        ctl = CONTROL.get(k)
+        if ctl is None:
+            del self._payload[k]
+            return
+        with self._payload._lock:
+            if getattr(self._state, ctl[0]) is None:
+                raise KeyError(k)
+            setattr(self._state, ctl[0], None)
+            del self._csizes[k]
+            self._payload._touch(k)
+
+    def __contains__(self, k):
+        ctl = CONTROL.get(k)
+        if ctl is None:
+            return k in self._payload
+        return getattr(self._state, ctl[0]) is not None
+
+    def __iter__(self):
+        for k, (slot, _) in CONTROL.items():
+            if getattr(self._state, slot) is not None:
+                yield k
+        yield from self._payload
+
+    def __len__(self):
+        return len(self._csizes) + len(self._payload)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+    @property
+    def dirty(self):
+        return self._payload.dirty
+
+    def subscribe(self):
+        return self._payload.subscribe()
+
+    def unsubscribe(self, s):
+        self._payload.unsubscribe(s)
+
+    def size_estimate(self):
+        # == len(str(dict(self)))
+        n = len(self)
+        return 2 + self._payload._total + sum(self._csizes.values()) + 2 * (n - 1) if n else 2
+
+def _control(key):
+    slot = CONTROL[key][0]
+    return property(lambda self: getattr(self, slot),
+                    lambda self, v: self._view.__setitem__(key, v))
+
 class SwarmState:
+    __slots__ = ("step", "metrics", "payload", "_view",
+                 "_plan", "_exec", "_fingerprint", "_gate", "_spawn")
+
     def __init__(self):
         self.step = 0
-        self.shared = {}
+        self.metrics = {}   # last step's drift/pressure/horizon/spawned (not part of shared)
+        self.payload = TrackedDict()   # free-form agent data
+        for slot, _ in CONTROL.values():
+            setattr(self, slot, None)
+        self._view = SharedView(self, self.payload)
+
+    # typed control plane (Gate / Spawn objects, plain strings otherwise);
+    # assigning goes through the view so dirty tracking and sizes stay exact
+    plan = _control("plan")
+    exec = _control("exec")
+    fingerprint = _control("fingerprint")
+    gate = _control("_gate")
+    spawn = _control("_spawn")
+
+    @property
+    def shared(self):
+        return self._view
+
+    @shared.setter
+    def shared(self, d):
+        self._view.clear()
+        self._view.update(d)
+
+    def as_dict(self):
+        return dict(self._view)
@@ -0,0 +1,158 @@
+import copy
+from collections.abc import Mapping
+
+# persistent, versioned view of state.shared. each committed step is a
+# Version holding only the keys that changed (an overlay) plus a pointer to
+# its parent, so unchanged values are shared with every earlier version.
+# committed values are private copies, never mutated afterwards: in-place
+# edits agents make to the live state cannot leak into history
+DELETED = object()
+FLATTEN_EVERY = 32  # bound lookup chains: every Nth version keeps a flat key map
+_ATOMS = (str, int, float, bool, type(None))
+
+def freeze(v):
+    return v if isinstance(v, _ATOMS) else copy.deepcopy(v)
+
+class Version(Mapping):
+    __slots__ = ("step", "parent", "changes", "depth", "size", "_flat")
+
+    def __init__(self, step, parent=None, changes=None):
+        self.step = step
+        self.parent = parent
+        self.changes = changes or {}   # key -> value or DELETED
+        self.depth = parent.depth + 1 if parent is not None else 0
+        size = parent.size if parent is not None else 0
+        for k, v in self.changes.items():
+            had = parent is not None and k in parent
+            size += (v is not DELETED) - had
+        self.size = size
+        self._flat = None
+        if self.depth % FLATTEN_EVERY == 0:
+            # shallow: references the same frozen values as the chain
+            self._flat = {k: self[k] for k in self._iter_chain()} if parent is not None else {}
+
+    def _lookup(self, k):
+        v = self
+        while v is not None:
+            if k in v.changes:
+                return v.changes[k]
+            if v._flat is not None:
+                return v._flat.get(k, DELETED)
+            v = v.parent
+        return DELETED
+
+    def _iter_chain(self):
+        seen = set()
+        v = self
+        while v is not None:
+            if v._flat is not None and v is not self:
+                for k in v._flat:
+                    if k not in seen:
+                        seen.add(k)
+                        if self._lookup(k) is not DELETED:
+                            yield k
+                return
+            for k in v.changes:
+                if k not in seen:
+                    seen.add(k)
+                    if self._lookup(k) is not DELETED:
+                        yield k
+            v = v.parent
+
+    def __getitem__(self, k):
+        v = self._lookup(k)
+        if v is DELETED:
+            raise KeyError(k)
+        return v
+
+    def __contains__(self, k):
+        return self._lookup(k) is not DELETED
+
+    def __iter__(self):
+        if self._flat is not None:
+            return iter(self._flat)
+        return self._iter_chain()
+
+    def __len__(self):
+        return self.size
+
+    def __repr__(self):
+        return f"Version(step={self.step}, keys={self.size})"
+
+def _ancestor(a, b):
+    # walk both chains down to their common version
+    while a.depth > b.depth:
+        a = a.parent
+    while b.depth > a.depth:
+        b = b.parent
+    while a is not b:
+        a, b = a.parent, b.parent
+    return a
+
+def _touched(v, stop):
+    keys = set()
+    while v is not stop:
+        keys.update(v.changes)
+        v = v.parent
+    return keys
+
+def diff(a, b):
+    # exact {key: (old, new)} between two versions of one store, missing side
+    # reported as DELETED. cost is the overlays between them, not the state size
+    base = _ancestor(a, b)
+    out = {}
+    for k in _touched(a, base) | _touched(b, base):
+        old, new = a._lookup(k), b._lookup(k)
+        if old is not new and old != new:
+            out[k] = (old, new)
+    return out
+
+class VersionStore:
+    def __init__(self):
+        self.root = Version(0)
+        self.head = self.root
+        self._by_step = {0: self.root}
+
+    def commit(self, step, changes):
+        # changes: key -> new value, or DELETED; values are copied on the way in
+        frozen = {k: v if v is DELETED else freeze(v) for k, v in changes.items()}
+        if not frozen:
+            # nothing changed: the step shares the previous version outright
+            self._by_step[step] = self.head
+            return self.head
+        self.head = Version(step, self.head, frozen)
+        self._by_step[step] = self.head
+        return self.head
+
+    def commit_from(self, step, shared, keys=None):
+        # commit the given keys (all of them when None) of a live mapping;
+        # keys whose value did not actually change stay out of the overlay
+        head = self.head
+        if keys is None:
+            keys = set(shared) | set(head)
+        changes = {}
+        for k in keys:
+            old = head._lookup(k)
+            if k in shared:
+                v = shared[k]
+                if old is DELETED or old != v:
+                    changes[k] = v
+            elif old is not DELETED:
+                changes[k] = DELETED
+        return self.commit(step, changes)
+
+    def at(self, step):
+        return self._by_step[step]
+
+    def rollback(self, step):
+        # moving head is O(1): no state is copied or replayed. versions after
+        # it are forgotten and the next commit branches from here
+        v = self._by_step[step]
+        for s in [s for s in self._by_step if s > step]:
+            del self._by_step[s]
+        self.head = v
+        return v
+
+    def diff(self, a, b):
+        return diff(self.at(a) if isinstance(a, int) else a,
+                    self.at(b) if isinstance(b, int) else b)
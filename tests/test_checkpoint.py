@@ -0,0 +1,50 @@
+import json, pathlib, pytest
+import run_swarm
+import tools.topology_memory as tm
+from engine.execution import executor
+from ledger.replay import iter_entries
+from ledger.columns import load_columns
+from ledger.ledger import LedgerWriter
+from ledger.segments import truncate_after, sealed_segments
+
+ARGS = ["--mode", "lab", "--steps", "24", "--no-converge", "--checkpoint-state-every", "5",
+        "--ledger-format", "delta", "--rotate-steps", "7"]
+
+def test_resume_after_crash_matches_uninterrupted_run(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(tm, "_migrated", False)
+    monkeypatch.setattr(tm, "_acc", tm.MemoryAccumulator())
+
+    def crash(state, mode="lab"):
+        if state.step == 13:
+            raise RuntimeError("crash")
+        return executor.step(state, mode)
+
+    monkeypatch.setattr(run_swarm, "step", crash)
+    with pytest.raises(RuntimeError):
+        run_swarm.main(ARGS + ["--run-dir", "runs/a"])
+    assert json.loads(pathlib.Path("runs/a/checkpoint.json").read_text())["step"] == 10
+    assert json.loads(pathlib.Path("memory/memory.json").read_text())["runs"] == 10
+
+    monkeypatch.setattr(run_swarm, "step", executor.step)
+    run_swarm.main(["--resume", "runs/a"])
+    run_swarm.main(ARGS + ["--run-dir", "runs/b"])
+
+    a = list(iter_entries("runs/a/ledger.jsonl"))
+    b = list(iter_entries("runs/b/ledger.jsonl"))
+    assert [e["step"] for e in a] == list(range(1, 25))
+    assert [e["shared"] for e in a] == [e["shared"] for e in b]
+    assert list(load_columns("runs/a")["step"]) == list(range(1, 25))
+    assert json.loads(pathlib.Path("memory/memory.json").read_text())["runs"] == 48
+
+def test_truncate_after_reopens_straddling_segment(tmp_path):
+    w = LedgerWriter(str(tmp_path), fmt="delta", checkpoint_every=3, rotate_steps=4)
+    for s in range(1, 12):
+        w.write(s, {"n": s})
+    path = str(tmp_path / "ledger.jsonl")
+    truncate_after(path, 6)
+    assert [seg["last_step"] for seg in sealed_segments(path)] == [4]
+    assert [e["step"] for e in iter_entries(path)] == list(range(1, 7))
+    w = LedgerWriter(str(tmp_path), fmt="delta", checkpoint_every=3)
+    w.write(7, {"n": 7})
+    assert [e["shared"]["n"] for e in iter_entries(path)] == list(range(1, 8))
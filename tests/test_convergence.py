@@ -0,0 +1,31 @@
+from engine.execution.convergence import Convergence
+from runtime.swarm_state.swarm_state import TrackedDict
+from agents.invariant_agent import InvariantAgent, merkle_root
+
+def test_fixed_point_after_patience():
+    c = Convergence(patience=3)
+    seq = ["a", "b", "c", "c", "c", "c"]
+    got = [c.observe(i, d, "OK") for i, d in enumerate(seq, 1)]
+    assert got == [None, None, None, None, "fixed_point", "fixed_point"]
+    assert c.as_dict(6, 40) == {"reason": "fixed_point", "period": 1, "converged_at": 5,
+                                "steps_run": 6, "steps_requested": 40}
+
+def test_cycle_and_gate_status_count():
+    c = Convergence(patience=3)
+    for i, d in enumerate(["x", "a", "b", "c", "a", "b"], 1):
+        assert c.observe(i, d, "OK") is None
+    assert c.observe(7, "c", "OK") == "cycle" and c.period == 3
+    c = Convergence(patience=2, cycles=False)
+    assert c.observe(1, "a", "OK") is None
+    assert c.observe(2, "a", "CONTRACTING") is None   # same state, gate moved
+    assert c.observe(3, "a", "CONTRACTING") == "fixed_point"
+    assert Convergence().as_dict(40, 40)["reason"] == "max_steps"
+
+def test_fingerprint_exclude():
+    d = TrackedDict(plan="active")
+    agent = InvariantAgent(verify=True)
+    d["fingerprint"] = agent.fingerprint(d)
+    h = agent.fingerprint(d, exclude=("fingerprint",))
+    assert h == merkle_root({"plan": "active"}) != agent.fingerprint(d)
+    d["fingerprint"] = "other"
+    assert agent.fingerprint(d, exclude=("fingerprint",)) == h
@@ -0,0 +1,102 @@
+from ledger.ledger import LedgerWriter
+from ledger.replay import iter_entries, iter_raw, state_at, last_n, replay_to_step
+
+def _states():
+    shared = {"plan": "active", "payload": {"n": 0}}
+    for i in range(1, 13):
+        shared = dict(shared)
+        shared["fingerprint"] = f"fp{i}"
+        shared["_gate"] = {"status": "OK" if i % 3 else "CONTRACTING"}
+        if i == 5:
+            shared["_spawn"] = {"agents": ["StabilizerAgent"]}
+        if i == 8:
+            del shared["_spawn"]
+        yield i, shared
+
+def test_delta_ledger_roundtrip(tmp_path):
+    full = LedgerWriter(str(tmp_path / "full"))
+    delta = LedgerWriter(str(tmp_path / "delta"), fmt="delta", checkpoint_every=4)
+    expected = {}
+    for i, shared in _states():
+        full.write(i, shared)
+        delta.write(i, shared)
+        expected[i] = shared
+
+    kinds = [e.get("kind") for e in iter_raw(delta.path)]
+    assert kinds.count("full") == 3 and kinds.count("delta") == 9
+
+    for path in (full.path, delta.path):
+        got = {e["step"]: e["shared"] for e in iter_entries(path)}
+        assert got == expected
+        assert state_at(9, path) == expected[9]
+        assert [e["step"] for e in last_n(3, path)] == [10, 11, 12]
+        assert replay_to_step(4, path)[-1]["shared"] == expected[4]
+
+def test_index_seek_and_rebuild(tmp_path):
+    import os
+    from ledger.index import build_index, open_index, index_path
+    w = LedgerWriter(str(tmp_path), fmt="delta", checkpoint_every=4)
+    expected = {}
+    for i, shared in _states():
+        w.write(i, shared)
+        expected[i] = shared
+
+    with open_index(w.path) as idx:
+        assert len(idx) == 12
+        assert idx.record(idx.bisect_step(7))[0] == 7
+    for k in (1, 4, 5, 9, 12):
+        assert state_at(k, w.path) == expected[k]
+    assert [e["step"] for e in replay_to_step(8, w.path, start=6)] == [6, 7, 8]
+
+    before = (tmp_path / "ledger.jsonl.idx").read_bytes()
+    os.remove(index_path(w.path))
+    assert state_at(9, w.path) == expected[9]  # falls back to scanning
+    assert build_index(w.path) == 12
+    assert (tmp_path / "ledger.jsonl.idx").read_bytes()[:16] == before[:16]
+
+def test_segment_rotation(tmp_path):
+    from ledger.segments import sealed_segments
+    w = LedgerWriter(str(tmp_path), fmt="delta", checkpoint_every=100, rotate_steps=5, codec="lzma")
+    expected = {}
+    for i, shared in _states():
+        w.write(i, shared)
+        expected[i] = shared
+
+    segs = sealed_segments(w.path)
+    assert [(s["first_step"], s["last_step"]) for s in segs] == [(1, 5), (6, 10)]
+    assert {e["step"]: e["shared"] for e in iter_entries(w.path)} == expected
+    assert state_at(7, w.path) == expected[7]
+    assert [e["step"] for e in last_n(4, w.path)] == [9, 10, 11, 12]
+    assert [e["step"] for e in replay_to_step(12, w.path, start=11)] == [11, 12]
+
+def test_columns_store(tmp_path):
+    from ledger.columns import ColumnWriter, load_columns, aggregate
+    w = ColumnWriter(str(tmp_path), flush_every=4)
+    for i in range(1, 11):
+        gate = {"alpha": 0.85, "alpha_eff": 0.9 + i / 10, "status": "CONTRACTING" if i > 1 else "OK"}
+        w.append(i, gate, drift=0.1, pressure=i / 10, spawned=["StabilizerAgent"] if i % 2 else [])
+    w.flush()
+
+    cols = load_columns(str(tmp_path))
+    assert list(cols["step"]) == list(range(1, 11))
+    agg = aggregate(cols)
+    assert agg["contracting_steps"] == 9
+    assert agg["spawn_counts"] == {"StabilizerAgent": 5, "SummarizerAgent": 0}
+    assert abs(agg["pressure_max"] - 1.0) < 1e-9
+
+def test_query_streams_matches(tmp_path):
+    from ledger.query import query
+    full = LedgerWriter(str(tmp_path / "full"))
+    delta = LedgerWriter(str(tmp_path / "delta"), fmt="delta", checkpoint_every=4, rotate_steps=5)
+    expected = {}
+    for i, shared in _states():
+        full.write(i, shared)
+        delta.write(i, shared)
+        expected[i] = shared
+
+    for path in (full.path, delta.path):
+        hits = list(query(path, status="CONTRACTING"))
+        assert [e["step"] for e in hits] == [3, 6, 9, 12]
+        assert all(e["shared"] == expected[e["step"]] for e in hits)
+        hits = query(path, status="OK", spawned="StabilizerAgent", step_from=6, step_to=10)
+        assert [e["step"] for e in hits] == [7]
@@ -0,0 +1,19 @@
+import json, os, pathlib
+import run_multi
+
+def test_run_many_isolates_run_dirs_and_summarizes(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    specs = [{"name": "a", "root": ".", "args": ["--mode", "lab", "--steps", "8"]},
+             {"name": "b", "root": ".", "args": ["--mode", "lab", "--steps", "3", "--no-converge"]}]
+    out_dir, summary = run_multi.run_many(specs, workers=2, out_dir="multi")
+    assert summary["swarms"] == 2 and summary["failed"] == 0
+    a, b = summary["swarms_detail"]
+    assert a["run_dir"] != b["run_dir"] and b["steps"] == 3 and a["termination"] == "fixed_point"
+    assert summary["steps"] == a["steps"] + b["steps"]
+    assert summary["gate_outcomes"] == {"CONTRACTING": 2}
+    assert a["rows"] == a["steps"] and b["rows"] == 3 and b["contracting_steps"] == 2
+    for r in (a, b):
+        assert os.path.exists(os.path.join(r["run_dir"], "ledger.jsonl"))
+        assert "MONITOR STEP" in pathlib.Path(r["run_dir"], "stdout.log").read_text(encoding="utf-8")
+    with open(os.path.join(out_dir, "summary.json"), encoding="utf-8") as f:
+        assert json.load(f)["swarms"] == 2
@@ -0,0 +1,85 @@
+import threading
+from engine.execution.scheduler import Scheduler, plan_stages
+from runtime.swarm_state.swarm_state import SwarmState
+from agents.planner_agent import PlannerAgent
+from agents.execution_agent import ExecutionAgent
+from agents.invariant_agent import InvariantAgent, merkle_root
+from agents.stabilizer_agent import StabilizerAgent
+from agents.summarizer_agent import SummarizerAgent
+
+class _Slow:
+    reads = ()
+
+    def __init__(self, key, barrier):
+        self.writes = (key,)
+        self.barrier = barrier
+
+    def act(self, state):
+        self.barrier.wait(timeout=5)  # only passes when both agents run at once
+        state.shared[self.writes[0]] = threading.current_thread().name
+        return state
+
+class _Undeclared:
+    def act(self, state):
+        return state
+
+def test_stages_follow_declared_keys():
+    p, e, i = PlannerAgent(), ExecutionAgent(), InvariantAgent()
+    st, su, u = StabilizerAgent(), SummarizerAgent(), _Undeclared()
+    assert plan_stages([p, e, i]) == [[p, e], [i]]
+    assert plan_stages([st, su]) == [[st], [su]]
+    assert plan_stages([p, u, e]) == [[p], [u], [e]]
+
+def test_disjoint_writers_run_concurrently():
+    b = threading.Barrier(2)
+    s = SwarmState()
+    inv = InvariantAgent()
+    Scheduler([_Slow("a", b), _Slow("b", b), inv]).run(s)
+    assert s.shared["a"] != s.shared["b"]
+    assert s.fingerprint == merkle_root({k: v for k, v in s.shared.items() if k != "fingerprint"})
+
+class _Copy:
+    reads = ("src",)
+    writes = ("dst",)
+
+    def __init__(self):
+        self.calls = 0
+
+    def act(self, state):
+        self.calls += 1
+        state.shared["dst"] = state.shared.get("src")
+        return state
+
+def test_reactive_runs_only_on_changed_inputs():
+    s = SwarmState()
+    p, c, inv = PlannerAgent(), _Copy(), InvariantAgent()
+    sched = Scheduler([p, c, inv], reactive=True)
+    sched.run(s)
+    assert (sched.ran, sched.skipped) == (3, 0)
+    s.shared["src"] = 1
+    sched.run(s)                      # copy + invariant react, planner does not
+    assert c.calls == 2 and s.shared["dst"] == 1 and sched.skipped == 1
+    s.shared["src"] = 1               # equal value: not a change
+    s.shared["plan"] = "active"
+    sched.run(s)
+    assert c.calls == 2 and sched.skipped == 4
+
+def test_memo_replays_pure_agents_within_lru_bound():
+    from engine.execution.memo import Memo
+    from agents.monitor_agent import MonitorAgent
+
+    class _Count(_Copy):
+        pure = True
+
+    memo = Memo(maxsize=2)
+    s, c = SwarmState(), _Count()
+    for v in (1, 2, 1, 2, 3, 1):
+        s.shared["src"] = {"v": v}
+        memo.act(c, s)
+        assert s.shared["dst"] == {"v": v}
+    assert (memo.hits, memo.misses, c.calls) == (2, 4, 4)   # 1 was evicted by 3
+    s.shared["dst"]["v"] = 99                                  # replayed values are copies
+    s.shared["src"] = {"v": 1}
+    memo.act(c, s)
+    assert s.shared["dst"] == {"v": 1}
+    assert not memo.cacheable(MonitorAgent()) and memo.stats["_Count"]["hits"] == 3
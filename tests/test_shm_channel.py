@@ -0,0 +1,31 @@
+import multiprocessing as mp
+from runtime.shm_channel import MetricBoard, Manifest, publish_manifest
+
+def _worker(name, slot, n):
+    board = MetricBoard.attach(name)
+    for i in range(n):
+        board.append(slot, i + 1, 0.1 * slot, 0.3, 1.2, 4.9, 1, slot)
+    board.close()
+
+def test_manifest_roundtrip_in_place():
+    items = [{"path": "a.py", "bytes": 3}, {"path": "dir/b€.txt", "bytes": -1}, {"path": "c", "bytes": 10}]
+    with publish_manifest(items) as owner, Manifest.attach(owner.name) as m:
+        assert len(m) == 3 and list(m) == items
+        assert m.path(1) == "dir/b€.txt" and m.total_bytes() == 13
+
+def test_metric_board_gathers_all_workers():
+    board = MetricBoard.create(slots=3, capacity=4)
+    try:
+        procs = [mp.Process(target=_worker, args=(board.name, s, n)) for s, n in ((0, 2), (2, 6))]
+        for p in procs:
+            p.start()
+        for p in procs:
+            p.join()
+            assert p.exitcode == 0
+        rows = board.gather()
+        assert [len(rows[s]) for s in range(3)] == [2, 0, 4]    # slot 2 capped at capacity
+        assert [int(r["step"]) for r in rows[2]] == [1, 2, 3, 4]
+        assert float(rows[0][1]["alpha_eff"]) == 1.2 and int(rows[2][0]["spawn"]) == 2
+        del rows
+    finally:
+        board.close()
@@ -0,0 +1,100 @@
+from runtime.swarm_state.swarm_state import TrackedDict
+from metrics.drift import compute_drift
+
+def test_tracked_dict_dirty_and_size():
+    d = TrackedDict(plan="active")
+    feed = d.subscribe()
+    d["exec"] = "running"
+    d["_gate"] = {"alpha": 0.85, "status": "OK"}
+    d.setdefault("plan", "other")
+    d.pop("exec")
+    d.update(summary="keys=2")
+    assert d.dirty == {"plan", "exec", "_gate", "summary"}
+    assert feed == {"exec", "_gate", "summary"}
+    assert d.size_estimate() == len(str(d))
+    d.clear()
+    assert d.size_estimate() == len(str(d)) == 2
+
+def test_drift_from_changed_keys_matches_full_compare():
+    prev = {"plan": "active", "fingerprint": "a"}
+    curr = TrackedDict(prev)
+    curr.dirty.clear()
+    curr["plan"] = "active"
+    assert compute_drift(prev, curr, curr.dirty) == compute_drift(prev, curr) == 0.0
+    curr["fingerprint"] = "b"
+    assert compute_drift(prev, curr, curr.dirty) == compute_drift(prev, curr) == 0.1
+
+def test_incremental_fingerprint_matches_full():
+    import random
+    from agents.invariant_agent import InvariantAgent, merkle_root
+    agent = InvariantAgent(verify=True)
+    rng = random.Random(7)
+    a = TrackedDict()
+    for i in range(200):
+        k = f"k{rng.randrange(12)}"
+        if rng.random() < 0.2:
+            a.pop(k, None)
+        else:
+            a[k] = {"v": rng.randrange(5), "n": [i % 3]}
+        assert agent.fingerprint(a) == merkle_root(a)
+    b = TrackedDict(reversed(list(a.items())))
+    assert agent.fingerprint(b) == agent.fingerprint(a) == merkle_root(dict(a))
+
+def test_slotted_state_shared_view():
+    from runtime.swarm_state.swarm_state import SwarmState, Gate
+    s = SwarmState()
+    feed = s.shared.subscribe()
+    s.shared["plan"] = "active"
+    s.shared["_gate"] = {"alpha": 0.85, "alpha_eff": 0.9, "status": "OK"}
+    s.shared["summary"] = "keys=2"
+    assert isinstance(s.gate, Gate) and s.gate.status == "OK"
+    assert s.shared["_gate"] == {"alpha": 0.85, "alpha_eff": 0.9, "status": "OK"}
+    assert feed == {"plan", "_gate", "summary"}
+    assert s.shared.size_estimate() == len(str(dict(s.shared)))
+    s.shared["_gate"] = {"status": "odd"}   # shapes the slot cannot hold stay verbatim
+    assert s.gate == {"status": "odd"}
+    del s.shared["plan"]
+    assert "plan" not in s.shared and s.plan is None
+    assert s.shared.size_estimate() == len(str(s.as_dict()))
+    assert not hasattr(s, "__dict__")
+
+def test_version_store_diff_and_rollback():
+    from runtime.swarm_state.versions import VersionStore, DELETED
+    store = VersionStore()
+    live = {"plan": "active", "nested": {"n": [1]}}
+    store.commit_from(1, live)
+    live["nested"]["n"].append(2)            # in-place edit must not leak into history
+    store.commit_from(2, live, {"nested"})
+    assert store.at(1)["nested"] == {"n": [1]}
+    assert store.diff(1, 2) == {"nested": ({"n": [1]}, {"n": [1, 2]})}
+    for i in range(3, 80):                   # cross several flattened versions
+        live[f"k{i % 5}"] = i
+        if i % 7 == 0:
+            live.pop("plan", None)
+        store.commit_from(i, live)
+        assert dict(store.head) == live and len(store.head) == len(live)
+    assert store.diff(79, 79) == {}
+    d = store.diff(2, 79)
+    assert d["plan"] == ("active", DELETED) and d["k0"] == (DELETED, 75)
+    store.rollback(2)
+    assert dict(store.head) == {"plan": "active", "nested": {"n": [1, 2]}}
+    store.commit_from(3, {"plan": "idle"})
+    assert store.diff(2, 3) == {"plan": ("active", "idle"), "nested": ({"n": [1, 2]}, DELETED)}
+
+def test_executor_rollback_restores_shared(tmp_path, monkeypatch):
+    import tools.topology_memory as tm
+    from runtime.swarm_state.swarm_state import SwarmState
+    from engine.execution import executor
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(tm, "_migrated", False)
+    monkeypatch.setattr(tm, "_acc", tm.MemoryAccumulator())
+    s = SwarmState()
+    for _ in range(4):
+        executor.step(s)
+    snap = s.as_dict()
+    for _ in range(3):
+        executor.step(s)
+    executor.rollback(s, 4)
+    assert s.step == 4 and s.as_dict() == snap
+    executor.step(s)
+    assert s.step == 5 and executor.versions().head.step == 5
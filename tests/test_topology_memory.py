@@ -0,0 +1,62 @@
+import json, multiprocessing
+import tools.topology_memory as tm
+
+def test_topology_log_compaction_and_migration(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(tm, "COMPACT_EVERY", 4)
+    monkeypatch.setattr(tm, "_migrated", False)
+    monkeypatch.setattr(tm, "_acc", tm.MemoryAccumulator(every_steps=1))
+    legacy = {"events": [{"ts": 1.0, "step": 1, "spawned": [], "reason": {"gate": "OK"}}]}
+    (tmp_path / "topology").mkdir()
+    (tmp_path / "topology" / "topology.json").write_text(json.dumps(legacy), encoding="utf-8")
+
+    for i in range(2, 8):
+        tm.topo_event(i, ["StabilizerAgent"], {"gate": "CONTRACTING"})
+        tm.memory_update("CONTRACTING", 0.1, 0.2, ["StabilizerAgent"])
+
+    topo = tm.read_topology()
+    assert [e["step"] for e in topo["events"]] == list(range(1, 8))
+    assert topo["summary"]["spawn_counts"] == {"StabilizerAgent": 6}
+    assert topo["summary"]["gate_counts"] == {"OK": 1, "CONTRACTING": 6}
+    snap = json.loads((tmp_path / "topology" / "topology.json").read_text(encoding="utf-8"))
+    assert len(snap["events"]) == 5 and "summary" in snap
+    assert len((tmp_path / "topology" / "events.jsonl").read_text().splitlines()) == 2
+
+def test_memory_accumulator_checkpoints(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(tm, "_migrated", False)
+    monkeypatch.setattr(tm, "_acc", tm.MemoryAccumulator(every_steps=3, every_secs=3600))
+    mem_file = tmp_path / "memory" / "memory.json"
+
+    for i in range(4):
+        tm.topo_event(i, [], {"gate": "OK"})
+        tm.memory_update("OK" if i else "CONTRACTING", 0.0, 0.1, [])
+    on_disk = json.loads(mem_file.read_text(encoding="utf-8"))
+    assert on_disk["runs"] == 3 and tm.read_memory()["runs"] == 4
+    assert len(tm.read_topology()["events"]) == 4
+
+    tm.flush()
+    on_disk = json.loads(mem_file.read_text(encoding="utf-8"))
+    assert (on_disk["runs"], on_disk["ok_steps"], on_disk["contracting_steps"]) == (4, 3, 1)
+    assert not list((tmp_path / "memory").glob("*.tmp"))
+
+def _swarm_worker(n):
+    tm._acc = tm.MemoryAccumulator(every_steps=7)
+    for i in range(n):
+        tm.topo_event(i, ["StabilizerAgent"], {"gate": "CONTRACTING"})
+        tm.memory_update("CONTRACTING", 0.1, 0.3, ["StabilizerAgent"])
+    tm.flush()
+
+def test_concurrent_processes_merge(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(tm, "COMPACT_EVERY", 30)
+    procs = [multiprocessing.get_context("fork").Process(target=_swarm_worker, args=(40,)) for _ in range(4)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join()
+
+    mem = json.loads((tmp_path / "memory" / "memory.json").read_text(encoding="utf-8"))
+    assert mem["runs"] == 160 and mem["spawn_counts"] == {"StabilizerAgent": 160}
+    monkeypatch.setattr(tm, "_acc", tm.MemoryAccumulator())
+    assert len(tm.read_topology()["events"]) == 160
@@ -1,4 +1,5 @@
 ﻿import os, shutil, time, json, hashlib
+from tools.fs_lock import locked_append
 
 SKIP_DIRS = {'.git','__pycache__','.venv','node_modules','dist','build','.snapshots'}
 
@@ -65,11 +66,9 @@ def repo_fingerprint(root, max_files=20000):
     return h.hexdigest()
 
 def append_apply_log(entry, path=os.path.join("patches","applied_log.jsonl")):
-    os.makedirs(os.path.dirname(path), exist_ok=True)
     entry = dict(entry)
     entry["ts"] = time.time()
-    with open(path, "a", encoding="utf-8") as f:
-        f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+    locked_append(path, json.dumps(entry, ensure_ascii=False) + "\n")
 
 def ensure_utf8_no_bom(path, text):
     # Always write UTF-8 without BOM
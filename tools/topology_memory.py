@@ -1,8 +1,22 @@
-﻿import os, json, time
+﻿import os, json, time, atexit, glob, uuid
+from tools.fs_lock import file_lock
 
 TOPO_PATH = os.path.join("topology", "topology.json")
+TOPO_LOG  = os.path.join("topology", "events.jsonl")
 MEM_PATH  = os.path.join("memory", "memory.json")
 
+# topology events are appended to TOPO_LOG; every COMPACT_EVERY events the log
+# is folded into the TOPO_PATH snapshot (events + summary) and truncated.
+# appends and compaction run under TOPO_LOG's file lock, memory merges under
+# MEM_PATH's, so several swarm processes can share both stores
+COMPACT_EVERY = 500
+_migrated = False  # legacy snapshot check done in this process
+
+# memory counters and topology events accumulate in-process and hit disk
+# every CHECKPOINT_STEPS steps / CHECKPOINT_SECS seconds and at exit
+CHECKPOINT_STEPS = 25
+CHECKPOINT_SECS = 5.0
+
 def _load_json(path, default):
     try:
         if os.path.exists(path):
@@ -13,43 +27,206 @@ def _load_json(path, default):
     return default
 
 def _save_json(path, obj):
+    # temp file + rename: readers never see a half-written file
     os.makedirs(os.path.dirname(path), exist_ok=True)
-    with open(path, "w", encoding="utf-8") as f:
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
         json.dump(obj, f, indent=2)
+    os.replace(tmp, path)
 
-def topo_event(step, spawned, reason):
+def _read_events(path):
+    events = []
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    events.append(json.loads(line))
+                except Exception:
+                    continue  # torn last line after a crash
+    return events
+
+def _count_lines(path):
+    if not os.path.exists(path):
+        return 0
+    with open(path, "rb") as f:
+        return f.read().count(b"\n")
+
+def _compacting_logs():
+    # logs renamed aside by a compaction: <TOPO_LOG>.<token>.compacting
+    return sorted(glob.glob(glob.escape(TOPO_LOG) + ".*.compacting"))
+
+def _token(path):
+    return path[len(TOPO_LOG) + 1:-len(".compacting")]
+
+def _summarize(events):
+    spawn_counts, gate_counts = {}, {}
+    for e in events:
+        for a in e.get("spawned") or []:
+            spawn_counts[a] = spawn_counts.get(a, 0) + 1
+        g = (e.get("reason") or {}).get("gate")
+        if g is not None:
+            gate_counts[g] = gate_counts.get(g, 0) + 1
+    return {
+        "events": len(events),
+        "first_ts": events[0].get("ts") if events else None,
+        "last_ts": events[-1].get("ts") if events else None,
+        "last_step": events[-1].get("step") if events else None,
+        "spawn_counts": spawn_counts,
+        "gate_counts": gate_counts,
+    }
+
+def _read_topology(buffered=()):
     topo = _load_json(TOPO_PATH, {"events": []})
-    topo["events"].append({
-        "ts": time.time(),
-        "step": step,
-        "spawned": spawned,
-        "reason": reason
-    })
+    log = []
+    # a log set aside by a compaction that crashed before the snapshot landed
+    for p in _compacting_logs():
+        if _token(p) != topo.get("compacted"):
+            log += _read_events(p)
+    log += _read_events(TOPO_LOG) + list(buffered)
+    if log:
+        topo["events"] = topo.get("events", []) + log
+        topo["summary"] = _summarize(topo["events"])
+    elif "summary" not in topo:
+        topo["summary"] = _summarize(topo.get("events", []))
+    return topo
+
+def read_topology():
+    # same view as the legacy topology.json: {"events": [...]} (+ "summary")
+    return _read_topology(_acc.events)
+
+def _compact_locked():
+    # set the log aside under a fresh token, fold it into the snapshot, then
+    # drop it; the token in the snapshot tells readers it is already folded
+    token = uuid.uuid4().hex
+    if os.path.exists(TOPO_LOG):
+        os.replace(TOPO_LOG, f"{TOPO_LOG}.{token}.compacting")
+    topo = _read_topology()
+    topo["compacted"] = token
     _save_json(TOPO_PATH, topo)
+    for p in _compacting_logs():
+        os.remove(p)
+    return topo
 
-def memory_update(gate_status, drift, pressure, spawned):
-    mem = _load_json(MEM_PATH, {
+def compact_topology():
+    with file_lock(TOPO_LOG):
+        return _compact_locked()
+
+def _append_events(events):
+    global _migrated
+    os.makedirs(os.path.dirname(TOPO_LOG), exist_ok=True)
+    with file_lock(TOPO_LOG):
+        if not _migrated:
+            # first write in this process: migrate a legacy snapshot (no summary)
+            if os.path.exists(TOPO_PATH) and "summary" not in _load_json(TOPO_PATH, {}):
+                _compact_locked()
+            _migrated = True
+        with open(TOPO_LOG, "a", encoding="utf-8") as f:
+            f.write("".join(json.dumps(e, ensure_ascii=False) + "\n" for e in events))
+        if _count_lines(TOPO_LOG) >= COMPACT_EVERY:
+            _compact_locked()
+
+def _new_memory():
+    return {
         "runs": 0,
         "contracting_steps": 0,
         "ok_steps": 0,
         "spawn_counts": {},
         "last": {}
-    })
-    mem["runs"] = int(mem.get("runs", 0)) + 1
-    if gate_status == "CONTRACTING":
-        mem["contracting_steps"] = int(mem.get("contracting_steps", 0)) + 1
-    else:
-        mem["ok_steps"] = int(mem.get("ok_steps", 0)) + 1
-
-    sc = mem.get("spawn_counts", {})
-    for a in (spawned or []):
-        sc[a] = int(sc.get(a, 0)) + 1
-    mem["spawn_counts"] = sc
-
-    mem["last"] = {
-        "gate": gate_status,
-        "drift": float(drift),
-        "pressure": float(pressure),
-        "spawned": list(spawned or [])
     }
-    _save_json(MEM_PATH, mem)
+
+def _merge(mem, delta, last):
+    # counters are additive, so concurrent processes merge instead of overwrite
+    for k in ("runs", "contracting_steps", "ok_steps"):
+        mem[k] = int(mem.get(k, 0)) + delta[k]
+    sc = mem.setdefault("spawn_counts", {})
+    for a, n in delta["spawn_counts"].items():
+        sc[a] = int(sc.get(a, 0)) + n
+    if last is not None:
+        mem["last"] = last
+    return mem
+
+class MemoryAccumulator:
+    def __init__(self, every_steps=CHECKPOINT_STEPS, every_secs=CHECKPOINT_SECS):
+        self.every_steps = every_steps
+        self.every_secs = every_secs
+        self.delta = None    # counter increments since the last checkpoint
+        self.last = None
+        self.events = []     # topology events not yet appended to TOPO_LOG
+        self._steps = 0      # updates since the last checkpoint
+        self._last = time.monotonic()
+        self._reset()
+
+    def _reset(self):
+        self.delta = {"runs": 0, "contracting_steps": 0, "ok_steps": 0, "spawn_counts": {}}
+        self.last = None
+        self._steps = 0
+
+    def event(self, step, spawned, reason):
+        self.events.append({
+            "ts": time.time(),
+            "step": step,
+            "spawned": spawned,
+            "reason": reason
+        })
+
+    def update(self, gate_status, drift, pressure, spawned):
+        d = self.delta
+        d["runs"] += 1
+        if gate_status == "CONTRACTING":
+            d["contracting_steps"] += 1
+        else:
+            d["ok_steps"] += 1
+
+        sc = d["spawn_counts"]
+        for a in (spawned or []):
+            sc[a] = sc.get(a, 0) + 1
+
+        self.last = {
+            "gate": gate_status,
+            "drift": float(drift),
+            "pressure": float(pressure),
+            "spawned": list(spawned or [])
+        }
+        self._steps += 1
+        if self._steps >= self.every_steps or time.monotonic() - self._last >= self.every_secs:
+            self.checkpoint()
+
+    def memory(self):
+        return _merge(_load_json(MEM_PATH, _new_memory()), self.delta, self.last)
+
+    def checkpoint(self):
+        if self.events:
+            events, self.events = self.events, []
+            _append_events(events)
+        if self._steps:
+            with file_lock(MEM_PATH):
+                _save_json(MEM_PATH, self.memory())
+            self._reset()
+        self._last = time.monotonic()
+
+    def discard(self):
+        # drop everything since the last checkpoint (a resumed run redoes it)
+        self.events = []
+        self._reset()
+
+_acc = MemoryAccumulator()
+atexit.register(lambda: _acc.checkpoint())
+
+def topo_event(step, spawned, reason):
+    _acc.event(step, spawned, reason)
+
+def memory_update(gate_status, drift, pressure, spawned):
+    _acc.update(gate_status, drift, pressure, spawned)
+
+def read_memory():
+    return _acc.memory()
+
+def flush():
+    _acc.checkpoint()
+
+def discard_pending():
+    _acc.discard()
+
+def manual_checkpoints():
+    # only flush() writes: keeps memory/topology in step with run checkpoints
+    _acc.every_steps = _acc.every_secs = float("inf")